@@ -0,0 +1,74 @@
+"""Generate reproducible synthetic corpora for benchmarks.
+
+The texts are tokenized as expected by ``getmeasures()``: one sentence per
+line, tokens separated by spaces, and paragraphs separated by an empty line.
+Words are drawn with a Zipfian distribution from the basic word list of the
+language, mixed with compounds of such words, numbers, and punctuation."""
+
+from __future__ import division, print_function, unicode_literals
+import os
+import sys
+import random
+
+PUNCT = [',', ',', ';', ':', '(', ')', '"', "'"]
+ENDPUNCT = ['.', '.', '.', '?', '!']
+
+
+def vocabulary(lang, seed=0):
+	"""Return a list of word types for a language, most frequent first."""
+	from readability.langdata import LANGDATA
+	rnd = random.Random(seed)
+	words = sorted(LANGDATA[lang]['basicwords'])
+	rnd.shuffle(words)
+	compounds = [a + b for a, b in zip(words, reversed(words))]
+	return words + compounds[:len(words) // 2]
+
+
+def generate(lang='en', words=10000, seed=0):
+	"""Return a synthetic tokenized text of approximately ``words`` tokens.
+
+	:param lang: a language code with a basic word list in ``LANGDATA``.
+	:param words: the number of tokens to generate.
+	:param seed: the seed of the random generator; the same arguments always
+		give the same text."""
+	rnd = random.Random(seed)
+	vocab = vocabulary(lang, seed)
+	paragraphs = []
+	total = 0
+	while total < words:
+		sents = []
+		for _ in range(rnd.randint(1, 8)):
+			sent = []
+			for _ in range(rnd.randint(4, 30)):
+				x = rnd.random()
+				if x < 0.08:
+					sent.append(rnd.choice(PUNCT))
+				elif x < 0.1:
+					sent.append(str(rnd.randint(1, 2000)))
+				else:  # a log-uniform rank approximates Zipf's law
+					sent.append(vocab[int(len(vocab) ** rnd.random()) - 1])
+			sent[0] = sent[0][:1].upper() + sent[0][1:]
+			if rnd.random() < 0.05:
+				sent.insert(0, '-')
+			sent.append(rnd.choice(ENDPUNCT))
+			total += len(sent)
+			sents.append(' '.join(sent))
+		paragraphs.append('\n'.join(sents))
+	return '\n\n'.join(paragraphs) + '\n'
+
+
+def main():
+	"""Write a corpus to standard output.
+
+	Usage: python benchmarks/corpus.py [LANG [WORDS [SEED]]]"""
+	sys.path.insert(0, os.path.join(
+			os.path.dirname(os.path.abspath(__file__)), '..'))
+	args = sys.argv[1:]
+	lang = args[0] if args else 'en'
+	words = int(args[1]) if len(args) > 1 else 10000
+	seed = int(args[2]) if len(args) > 2 else 0
+	sys.stdout.write(generate(lang, words, seed))
+
+
+if __name__ == '__main__':
+	main()
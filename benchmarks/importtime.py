@@ -0,0 +1,65 @@
+"""Measure the time to import readability and to score a first text.
+
+Usage: python benchmarks/importtime.py [--runs=<n>] [--path=<dir>]
+
+Each measurement is made in a fresh interpreter, which times the given code
+itself so that interpreter startup is excluded. The median wall and CPU time
+over the runs are reported in milliseconds as JSON on standard output.
+
+Options:
+  --runs=<n>    Number of runs per measurement [default: 20].
+  --path=<dir>  Directory containing the readability package to measure
+                [default: the parent directory of this script]."""
+
+from __future__ import division, print_function
+import os
+import sys
+import json
+import getopt
+import subprocess
+
+SNIPPETS = [
+	('import', 'import readability'),
+	('import+en', 'import readability; '
+		'readability.getmeasures("A tokenized sentence .", lang="en")'),
+	('import+nl', 'import readability; '
+		'readability.getmeasures("Een zin .", lang="nl")'),
+	]
+TIMER = '''import time
+wall, cpu = time.perf_counter(), time.process_time()
+exec(%r)
+print(time.perf_counter() - wall, time.process_time() - cpu)'''
+
+
+def measure(code, path, runs):
+	"""Return the median wall and CPU time in milliseconds of running
+	``code`` in a fresh interpreter."""
+	env = dict(os.environ, PYTHONPATH=path)
+	wall, cpu = [], []
+	for _ in range(runs):
+		# run from path, since python -c puts the working directory first
+		# on sys.path
+		out = subprocess.check_output(
+				[sys.executable, '-c', TIMER % code], env=env, cwd=path)
+		a, b = out.split()
+		wall.append(1000 * float(a))
+		cpu.append(1000 * float(b))
+	wall.sort()
+	cpu.sort()
+	return dict(wall=round(wall[len(wall) // 2], 1),
+			cpu=round(cpu[len(cpu) // 2], 1))
+
+
+def main():
+	opts, _args = getopt.gnu_getopt(sys.argv[1:], '', ['runs=', 'path='])
+	opts = dict(opts)
+	runs = int(opts.get('--runs', 20))
+	path = os.path.abspath(opts.get('--path', os.path.join(
+			os.path.dirname(os.path.abspath(__file__)), '..')))
+	result = {name: measure(code, path, runs) for name, code in SNIPPETS}
+	json.dump(result, sys.stdout, sort_keys=True)
+	print()
+
+
+if __name__ == '__main__':
+	main()
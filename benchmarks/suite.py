@@ -0,0 +1,222 @@
+"""Benchmark suite for readability.
+
+Usage: python benchmarks/suite.py [options] [CASE...]
+or: python benchmarks/suite.py --compare OLD.json NEW.json
+
+Runs the benchmark cases whose names start with one of the given prefixes
+(default: all cases) on synthetic corpora generated by ``corpus.py``, and
+writes the results as JSON: for each case, the minimum and median time in
+milliseconds over the runs. Cases that need an optional dependency which is
+not installed are left out. With --compare, two such result files are shown
+side by side, e.g., to compare two commits checked out in different
+directories.
+
+Options:
+  --runs=<n>      Number of runs per case [default: 5].
+  --words=<n>     Number of tokens in the corpus of each language
+                  [default: 20000].
+  --path=<dir>    Directory containing the readability package to measure
+                  [default: the parent directory of this script].
+  --output=<file> Write results to file instead of standard output.
+  --compare       Compare two result files."""
+
+from __future__ import division, print_function
+import io
+import os
+import sys
+import json
+import time
+import getopt
+import shutil
+import platform
+import importlib.util
+import tempfile
+import subprocess
+
+LANGS = ('en', 'nl', 'de', 'fr')
+# count the syllables of the words on standard input; print the time in ms
+SYLLABLESEN = '''
+import sys, time
+from readability.langdata import countsyllables_en
+tokens = sys.stdin.read().split()
+start = time.perf_counter()
+for token in tokens:
+	countsyllables_en(token)
+print(1000 * (time.perf_counter() - start))
+'''
+
+
+def timeit(func, runs):
+	"""Return the minimum and median time in milliseconds of calling
+	``func`` a number of times. A function that measures its own time, such
+	as ``timesubprocess()``, returns it as a float in milliseconds."""
+	times = []
+	for _ in range(runs):
+		start = time.perf_counter()
+		result = func()
+		times.append(result if isinstance(result, float)
+				else 1000 * (time.perf_counter() - start))
+	times.sort()
+	return dict(min=round(times[0], 3), median=round(times[len(times) // 2], 3))
+
+
+def timesubprocess(code, data, env):
+	"""Run ``code`` in a new Python process with ``data`` on its standard
+	input; return the time in milliseconds that it prints."""
+	return float(subprocess.run([sys.executable, '-c', code],
+			input=data.encode('utf8'), stdout=subprocess.PIPE, env=env,
+			check=True).stdout)
+
+
+def getcases(path, words, tmpdir):
+	"""Return a list of (name, function) pairs with the benchmark cases."""
+	import readability
+	from readability import langdata
+	from corpus import generate
+	texts = {lang: generate(lang, words, seed=n)
+			for n, lang in enumerate(LANGS)}
+	env = dict(os.environ, PYTHONPATH=path)
+	cases = []
+	for lang in LANGS:
+		text = texts[lang]
+		lines = text.splitlines()
+		cases.append(('getmeasures.%s.string' % lang,
+				lambda text=text, lang=lang: readability.getmeasures(
+					text, lang=lang)))
+		cases.append(('getmeasures.%s.iterable' % lang,
+				lambda lines=lines, lang=lang: readability.getmeasures(
+					iter(lines), lang=lang)))
+
+	# the syllable counters are timed without memoization; older versions
+	# memoize the English counter in the module, so it is timed in a new
+	# process, once for each distinct word
+	tokens = '\n'.join(sorted(set(token for token in texts['en'].split()
+			if token[0].isalpha())))
+	cases.append(('syllables.countsyllables_en',
+			lambda tokens=tokens: timesubprocess(SYLLABLESEN, tokens, env)))
+	for lang in ('nl', 'de'):
+		tokens = [token for token in texts[lang].split()
+				if token[0].isalpha()]
+		cases.append(('syllables.countsyllables_nlde.%s' % lang,
+				lambda tokens=tokens: [langdata.countsyllables_nlde(token)
+					for token in tokens]))
+	# getsyllabifier() and getscanner() are not available in older versions
+	# given with --path
+	if (importlib.util.find_spec('pyphen') is not None
+			and hasattr(langdata, 'getsyllabifier')):
+		tokens = [token for token in texts['fr'].split()
+				if token[0].isalpha()]
+		syllabifier = langdata.getsyllabifier('fr')
+		cases.append(('syllables.count_syllables_fr', lambda: (
+				syllabifier.cache.clear(),
+				[langdata.count_syllables_fr(token) for token in tokens])))
+
+	for lang in LANGS:
+		text = texts[lang]
+		regexps = (list(langdata.LANGDATA[lang]['words'].values())
+				+ list(langdata.LANGDATA[lang]['beginnings'].values()))
+		if hasattr(langdata, 'getscanner'):
+			scanner = langdata.getscanner(lang)
+			cases.append(('wordusage.%s.scanner' % lang,
+					lambda text=text, scanner=scanner: scanner.scan(text)))
+		cases.append(('wordusage.%s.regex' % lang,
+				lambda text=text, regexps=regexps: [
+					sum(1 for _ in regexp.finditer(text))
+					for regexp in regexps]))
+
+	filenames = []
+	for n in range(20):
+		filename = os.path.join(tmpdir, 'doc%02d.txt' % n)
+		with io.open(filename, 'w', encoding='utf8') as out:
+			out.write(generate('en', words // 20, seed=100 + n))
+		filenames.append(filename)
+	if importlib.util.find_spec('pandas') is not None:
+		cases.append(('getdataframe.en', lambda: readability.getdataframe(
+				filenames, lang='en')))
+
+	script = os.path.join(path, 'bin', 'readability')
+	for name, args in (('cli.help', ['--help']),
+			('cli.score', [filenames[0]])):
+		cases.append((name, lambda args=args: subprocess.check_call(
+				[sys.executable, script] + args, env=env, cwd=path,
+				stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)))
+	return cases
+
+
+def getmeta(path, words, runs):
+	"""Return a description of the measurement environment."""
+	try:
+		commit = subprocess.check_output(
+				['git', 'rev-parse', 'HEAD'], cwd=path,
+				stderr=subprocess.DEVNULL).decode('ascii').strip()
+	except (OSError, subprocess.CalledProcessError):
+		commit = None
+	return dict(commit=commit, python=platform.python_version(),
+			platform=platform.platform(), date=time.strftime('%Y-%m-%d %H:%M'),
+			words=words, runs=runs)
+
+
+def run(path, words, runs, prefixes):
+	"""Run the selected cases and return the results as a dictionary."""
+	tmpdir = tempfile.mkdtemp()
+	try:
+		results = {}
+		for name, func in getcases(path, words, tmpdir):
+			if not prefixes or name.startswith(tuple(prefixes)):
+				func()  # warm up caches and lazily loaded data
+				results[name] = timeit(func, runs)
+				print('%-40s %10.1f ms' % (name, results[name]['median']),
+						file=sys.stderr)
+	finally:
+		shutil.rmtree(tmpdir)
+	return dict(meta=getmeta(path, words, runs), results=results)
+
+
+def compare(old, new):
+	"""Print the median times of two result files and their ratio."""
+	print('%-40s %12s %12s %8s' % ('case', 'old (ms)', 'new (ms)', 'ratio'))
+	for name in sorted(set(old['results']) | set(new['results'])):
+		a = old['results'].get(name, {}).get('median')
+		b = new['results'].get(name, {}).get('median')
+		print('%-40s %12s %12s %8s' % (name,
+				'-' if a is None else '%.1f' % a,
+				'-' if b is None else '%.1f' % b,
+				'%.2f' % (b / a) if a and b is not None else '-'))
+
+
+def main():
+	try:
+		opts, args = getopt.gnu_getopt(sys.argv[1:], '',
+				['runs=', 'words=', 'path=', 'output=', 'compare', 'help'])
+	except getopt.GetoptError as err:
+		print(err, file=sys.stderr)
+		print(__doc__, file=sys.stderr)
+		sys.exit(2)
+	opts = dict(opts)
+	if '--help' in opts:
+		print(__doc__)
+		return
+	if '--compare' in opts:
+		if len(args) != 2:
+			print(__doc__, file=sys.stderr)
+			sys.exit(2)
+		results = []
+		for filename in args:
+			with io.open(filename, encoding='utf8') as inp:
+				results.append(json.load(inp))
+		compare(*results)
+		return
+	path = os.path.abspath(opts.get('--path', os.path.join(
+			os.path.dirname(os.path.abspath(__file__)), '..')))
+	sys.path.insert(0, path)
+	result = run(path, int(opts.get('--words', 20000)),
+			int(opts.get('--runs', 5)), args)
+	if '--output' in opts:
+		with io.open(opts['--output'], 'w', encoding='utf8') as out:
+			out.write(json.dumps(result, indent=1, sort_keys=True))
+	else:
+		print(json.dumps(result, indent=1, sort_keys=True))
+
+
+if __name__ == '__main__':
+	main()
@@ -1,7 +1,9 @@
 """Simple readability measures.
 
-Usage: %(cmd)s [--lang=<x>] [FILE]
-or: %(cmd)s [--lang=<x>] --csv FILES...
+Usage: %(cmd)s [--lang=<x>] [--mmap] [FILE]
+or: %(cmd)s [--lang=<x>] [--jobs=<n>] [--mmap] --csv|--jsonl FILES...
+or: %(cmd)s [--lang=<x>] [--jobs=<n>] [--mmap] --arrow|--parquet FILES... >OUT
+or: %(cmd)s [--lang=<x>] [--jobs=<n>] [--host=<x>] [--port=<n>] --serve
 
 By default, input is read from standard input.
 Text should be encoded with UTF-8,
@@ -10,10 +12,38 @@ one sentence per line, tokens space-separated.
 Options:
   -L, --lang=<x>   Set language (available: %(lang)s).
   --csv            Produce a table in comma separated value format on
-                   standard output given one or more filenames.
+                   standard output given one or more filenames. Each row
+                   is written as soon as its file has been scored.
+  --jsonl          As --csv, but write a JSON object per line.
+  --arrow          As --csv, but write an Arrow IPC file; requires pyarrow.
+  --parquet        As --csv, but write a Parquet file; requires pyarrow.
+  --jobs=<n>       Score files for --csv with n parallel processes; a file
+                   that fails is reported in an error column. With
+                   --serve, the number of worker processes.
+  --lexicon=<file> Take syllable counts from a lexicon file built with
+                   python -m readability.lexicon; other words are counted
+                   with the heuristics of the language.
+  --mmap           Read files paragraph by paragraph from a memory map, so
+                   that memory use does not grow with the size of a file.
+                   Cannot be combined with --tokenizer.
   --tokenizer=<x>  Specify a tokenizer including options that will be given
                    each text on stdin and should return tokenized output on
-                   stdout. Not applicable when reading from stdin."""
+                   stdout. The tokenizer is kept running between files and
+                   should flush its output after each line of input.
+                   Not applicable when reading from stdin.
+                   With --tokenizer=builtin, raw text is tokenized with
+                   the rule-based tokenizer of readability.tokenizer;
+                   this also applies to stdin.
+  --cache=<dir>    Store the results of --csv in a directory, and only score
+                   files that are not in it; see readability.cache.
+  --cachesize=<n>  Remove the least recently used results when the cache
+                   exceeds n megabytes.
+  --stats=<file>   Write the time spent in each phase of counting, summed
+                   over all files, to file as JSON.
+  --serve          Run an HTTP server that scores JSON requests; see
+                   readability.server for the endpoints.
+  --host=<x>       Address the server listens on [default: 127.0.0.1].
+  --port=<n>       Port the server listens on [default: 8000]."""
 
 from __future__ import division, print_function, unicode_literals
 import io
@@ -24,17 +54,25 @@ except ImportError:
 	import re
 import sys
 import math
+import json
+import zlib
 import string
 import getopt
-import subprocess
+import itertools
 import collections
-from readability.langdata import LANGDATA
+from readability.langdata import LANGDATA, getsyllabifier, getscanner
+from readability.sketch import HyperLogLog
 if sys.version[0] >= '3':
 	unicode = str  # pylint: disable=invalid-name,redefined-builtin
 
+__version__ = '0.3.1'
+
 PARARE = re.compile('\n\n+')
 SENTRE = re.compile('[^\n]+(?:\n|$)')
 PUNCTRE = re.compile("^[%s]+$" % re.escape(string.punctuation))
+PUNCTCHARS = string.punctuation
+WORDBATCH = 65536  # maximum number of words counted at a time
+_workercache = None  # the ResultCache of a worker process of _scorefiles()
 
 # Match dashes at start of line, or any quotation mark used for direct speech
 # if used as separate token (rules out contractions, possessives, and hyphens
@@ -68,7 +106,7 @@ DIRECTSPEECHRE = re.compile(
 # U+00BB right-pointing double angle quotation mark
 
 
-def getmeasures(text, lang='en', merge=False):
+def getmeasures(text, lang='en', merge=False, sketch=None, stats=None):
 	"""Collect surface characteristics of a tokenized text.
 
 	>>> text = "A tokenized sentence .\\nAnother sentence ."
@@ -82,119 +120,249 @@ def getmeasures(text, lang='en', merge=False):
 		word types to count.
 	:param merge: if ``True``, return a dictionary results into a single
 		dictionary of key-value pairs.
+	:param sketch: if an integer, estimate ``wordtypes`` and
+		``type_token_ratio`` with a HyperLogLog sketch of this precision
+		(4-18) instead of storing every word type; see
+		``readability.sketch.HyperLogLog``.
+	:param stats: if given, a ``readability.instrument.Stats`` object to
+		which the time spent in each phase is added.
 	:returns: a two-level ordered dictionary with measurements."""
-	characters = 0
-	words = 0
-	syllables = 0
-	complex_words = 0
-	complex_words_dc = 0
-	complex_words_mes = 0 # Mesnager : To count complex words.
-	long_words = 0
-	paragraphs = 0
-	sentences = 0
-	directspeech = 0
-	vocabulary = set()
-	syllcounter = LANGDATA[lang]['syllables']
-	wordusageregexps = LANGDATA[lang]['words']
-	beginningsregexps = LANGDATA[lang]['beginnings']
-	basicwords = LANGDATA[lang].get('basicwords', frozenset())
-
-	wordusage = collections.OrderedDict([(name, 0) for name, regexp
-			in wordusageregexps.items()])
-	beginnings = collections.OrderedDict([(name, 0) for name, regexp
-			in beginningsregexps.items()])
+	return getcounts(text, lang, sketch, stats).measures(merge)
+
 
+def getcounts(text, lang='en', sketch=None, stats=None):
+	"""Collect the raw counts of a tokenized text.
+
+	:param text: a single unicode string or an iterable of lines, as for
+		``getmeasures()``.
+	:param lang: a language code.
+	:param sketch, stats: as for ``getmeasures()``.
+	:returns: a ``ReadabilityCounts`` object."""
+	acc = ReadabilityAccumulator(lang, sketch)
 	if isinstance(text, bytes):
 		raise ValueError('Expected: unicode string or an iterable of lines')
-	elif isinstance(text, unicode):
-		# Collect surface characteristics from a string.
-		# NB: only recognizes UNIX newlines.
-		paragraphs = sum(1 for _ in PARARE.finditer(text)) + 1
-		for sent in SENTRE.findall(text):
-			sentences += 1
-			directspeech += DIRECTSPEECHRE.search(sent) is not None
-		# paragraphs = text.count('\n\n')
-		# sentences = text.count('\n') - paragraphs
-		for token in text.split():
-			if PUNCTRE.match(token) is not None:
-				continue
-			vocabulary.add(token)
-			words += 1
-			characters += len(token)
-			syll = syllcounter(token)
-			syllables += syll
-			if len(token) >= 7:
-				long_words += 1
-
-			# ignore proper nouns and numbers
-			if not token[0].isupper() and not token.isdigit():
-				if syll >= 3:
-					complex_words += 1
-				if token.lower() not in basicwords:
-					complex_words_dc += 1
-					complex_words_mes += 1  # Mesnager : Mark word as complex if not in French basicwords list (string input).
-
-		for name, regexp in wordusageregexps.items():
-			wordusage[name] += sum(1 for _ in regexp.finditer(text))
-		for name, regexp in beginningsregexps.items():
-			beginnings[name] += sum(1 for _ in regexp.finditer(text))
+	elif stats is not None:
+		from readability.instrument import instrument
+		with instrument(acc, stats):
+			_addtext(acc, text)
+	else:
+		_addtext(acc, text)
+	return acc.counts
+
+
+def _addtext(acc, text):
+	"""Add a text given as a string or an iterable of lines."""
+	if isinstance(text, unicode):
+		acc._updatestring(text)
 	else:  # Collect surface characteristics from an iterable.
-		prevempty = True
-		for sent in text:
-			sent = sent.strip()
+		acc.update(text)
 
-			if prevempty and sent:
-				paragraphs += 1
-			elif not sent:
-				prevempty = True
-				continue
-			prevempty = False
-
-			sentences += 1
-			directspeech += DIRECTSPEECHRE.search(sent) is not None
-			for token in sent.split():
-				if PUNCTRE.match(token) is not None:
-					continue
-				vocabulary.add(token)
-				words += 1
-				characters += len(token)
-				syll = syllcounter(token)
-				syllables += syll
-				if len(token) >= 7:
-					long_words += 1
-
-				# ignore proper nouns and numbers
-				if not token[0].isupper() and not token.isdigit():
-					if syll >= 3:
-						complex_words += 1
-					if token.lower() not in basicwords:
-						complex_words_dc += 1
-						complex_words_mes += 1  # Mesnager: Mark word as complex if not in French basicwords list (iterable input).
-
-			for name, regexp in wordusageregexps.items():
-				wordusage[name] += sum(1 for _ in regexp.finditer(sent))
-			for name, regexp in beginningsregexps.items():
-				beginnings[name] += regexp.match(sent) is not None
-
-	if not words:
-		raise ValueError("I can't do this, there's no words there!")
-
-	stats = collections.OrderedDict([
-			('characters_per_word', characters / words),
-			('syll_per_word', syllables / words),
-			('words_per_sentence', words / sentences),
-			('sentences_per_paragraph', sentences / paragraphs),
-			('type_token_ratio', len(vocabulary) / words),
-			('directspeech_ratio', directspeech / sentences),
-			('characters', characters),
-			('syllables', syllables),
-			('words', words),
-			('wordtypes', len(vocabulary)),
-			('sentences', sentences),
-			('paragraphs', paragraphs),
-			('long_words', long_words),
-			('complex_words', complex_words),
-		])
+
+class ReadabilityCounts(object):
+	"""The raw counts from which the readability measures are computed.
+
+	Counts of texts in the same language can be added up, e.g., to combine the
+	chapters of a book that were scored separately; adding is associative.
+	The attributes have the names of the arguments of the formula functions,
+	so these can be applied to the totals directly, e.g.,
+	``KincaidGradeLevel(counts.syllables, counts.words, counts.sentences)``.
+
+	>>> counts = getcounts('A tokenized sentence .') + getcounts(
+	...		'Another sentence .')
+	>>> counts = ReadabilityCounts.loads(counts.dumps())
+	>>> counts.words, counts.sentences, len(counts.vocabulary)
+	(5, 2, 4)
+	>>> counts.measures() == getmeasures(
+	...		'A tokenized sentence .\\n\\nAnother sentence .')
+	True
+
+	:param lang: a language code.
+	:param sketch: if an integer, the ``vocabulary`` is a ``HyperLogLog``
+		sketch of this precision instead of a set; see ``getmeasures()``.
+	"""
+	FIELDS = ('characters', 'syllables', 'words', 'long_words',
+			'complex_words', 'complex_words_dc', 'complex_words_mes',
+			'sentences', 'paragraphs', 'directspeech')
+
+	def __init__(self, lang='en', sketch=None):
+		self.lang = lang
+		self.characters = 0
+		self.syllables = 0
+		self.words = 0
+		self.long_words = 0
+		self.complex_words = 0
+		self.complex_words_dc = 0
+		self.complex_words_mes = 0  # Mesnager : To count complex words.
+		self.sentences = 0
+		self.paragraphs = 0
+		self.directspeech = 0
+		self.vocabulary = set() if sketch is None else HyperLogLog(sketch)
+		self.wordusage = collections.OrderedDict([(name, 0) for name
+				in LANGDATA[lang]['words']])
+		self.beginnings = collections.OrderedDict([(name, 0) for name
+				in LANGDATA[lang]['beginnings']])
+
+	@property
+	def sketch(self):
+		"""The precision of the vocabulary sketch, or None if exact."""
+		if isinstance(self.vocabulary, HyperLogLog):
+			return self.vocabulary.precision
+		return None
+
+	def merge(self, other):
+		"""Add the counts of another text to these counts.
+
+		Counts that cannot be merged raise ``ValueError`` and are left
+		unchanged:
+
+		>>> counts = getcounts('A sentence .', sketch=12)
+		>>> counts.merge(getcounts('Another one .', sketch=10))
+		Traceback (most recent call last):
+		...
+		ValueError: cannot merge vocabulary sketches with precision 12 and 10.
+		>>> counts.words
+		2
+		"""
+		if other.lang != self.lang:
+			raise ValueError('cannot merge counts for %r with counts for %r'
+					% (self.lang, other.lang))
+		if (self.sketch is None) is not (other.sketch is None):
+			raise ValueError('cannot merge exact and approximate vocabulary.')
+		if self.sketch != other.sketch:
+			raise ValueError('cannot merge vocabulary sketches with precision '
+					'%d and %d.' % (self.sketch, other.sketch))
+		self.vocabulary.update(other.vocabulary)
+		for field in self.FIELDS:
+			setattr(self, field, getattr(self, field) + getattr(other, field))
+		for name, count in other.wordusage.items():
+			self.wordusage[name] += count
+		for name, count in other.beginnings.items():
+			self.beginnings[name] += count
+		return self
+
+	def copy(self):
+		"""Return an independent copy of these counts."""
+		return ReadabilityCounts(self.lang, self.sketch).merge(self)
+
+	def __iadd__(self, other):
+		return self.merge(other)
+
+	def __add__(self, other):
+		return self.copy().merge(other)
+
+	def __eq__(self, other):
+		return (isinstance(other, ReadabilityCounts)
+				and self.todict() == other.todict())
+
+	def __ne__(self, other):
+		return not self == other
+
+	def todict(self):
+		"""Return the counts as a dictionary of JSON serializable values."""
+		result = dict(lang=self.lang)
+		for field in self.FIELDS:
+			result[field] = getattr(self, field)
+		if self.sketch is None:
+			result['vocabulary'] = sorted(self.vocabulary)
+		else:
+			result['vocabulary'] = self.vocabulary.todict()
+		result['wordusage'] = list(self.wordusage.values())
+		result['beginnings'] = list(self.beginnings.values())
+		return result
+
+	@classmethod
+	def fromdict(cls, data):
+		"""Inverse of ``todict()``."""
+		result = cls(data['lang'])
+		for field in cls.FIELDS:
+			setattr(result, field, data[field])
+		if isinstance(data['vocabulary'], dict):
+			result.vocabulary = HyperLogLog.fromdict(data['vocabulary'])
+		else:
+			result.vocabulary = set(data['vocabulary'])
+		result.wordusage = collections.OrderedDict(
+				zip(result.wordusage, data['wordusage']))
+		result.beginnings = collections.OrderedDict(
+				zip(result.beginnings, data['beginnings']))
+		return result
+
+	def dumps(self):
+		"""Serialize to a compressed byte string."""
+		return zlib.compress(json.dumps(
+				self.todict(), separators=(',', ':')).encode('utf8'))
+
+	@classmethod
+	def loads(cls, data):
+		"""Inverse of ``dumps()``."""
+		return cls.fromdict(json.loads(zlib.decompress(data).decode('utf8')))
+
+	def measures(self, merge=False):
+		"""Apply the readability formulas to these counts.
+
+		:param merge: as for ``getmeasures()``.
+		:returns: the same dictionary as ``getmeasures()``."""
+		characters = self.characters
+		words = self.words
+		syllables = self.syllables
+		complex_words = self.complex_words
+		complex_words_dc = self.complex_words_dc
+		complex_words_mes = self.complex_words_mes
+		long_words = self.long_words
+		paragraphs = self.paragraphs
+		sentences = self.sentences
+		directspeech = self.directspeech
+		vocabulary = self.vocabulary
+		# copies, so that the result is not affected by later updates.
+		wordusage = collections.OrderedDict(self.wordusage)
+		beginnings = collections.OrderedDict(self.beginnings)
+		if not words:
+			raise ValueError("I can't do this, there's no words there!")
+
+		stats = collections.OrderedDict([
+				('characters_per_word', characters / words),
+				('syll_per_word', syllables / words),
+				('words_per_sentence', words / sentences),
+				('sentences_per_paragraph', sentences / paragraphs),
+				('type_token_ratio', len(vocabulary) / words),
+				('directspeech_ratio', directspeech / sentences),
+				('characters', characters),
+				('syllables', syllables),
+				('words', words),
+				('wordtypes', len(vocabulary)),
+				('sentences', sentences),
+				('paragraphs', paragraphs),
+				('long_words', long_words),
+				('complex_words', complex_words),
+			])
+		readability = getgrades(self.lang, characters, syllables, words,
+				sentences, long_words, complex_words, complex_words_dc,
+				complex_words_mes)
+		if 'DaleChallIndex' in readability:
+			stats['complex_words_dc'] = complex_words_dc
+			# Mesnager : Complex word count.
+			stats['complex_words_mes'] = complex_words_mes
+
+		if merge:
+			readability.update(stats)
+			readability.update(wordusage)
+			readability.update(beginnings)
+			return readability
+		return collections.OrderedDict([
+				('readability grades', readability),
+				('sentence info', stats),
+				('word usage', wordusage),
+				('sentence beginnings', beginnings),
+				])
+
+
+def getgrades(lang, characters, syllables, words, sentences, long_words,
+		complex_words, complex_words_dc, complex_words_mes):
+	"""Apply the readability formulas to the given counts.
+
+	:param lang: the language code; Dale-Chall and Mesnager are only
+		included for languages with a list of basic words.
+	:returns: the ordered dictionary of ``readability grades`` in the
+		result of ``getmeasures()``."""
 	readability = collections.OrderedDict([
 			('Kincaid', KincaidGradeLevel(syllables, words, sentences)),
 			('ARI', ARI(characters, words, sentences)),
@@ -210,53 +378,402 @@ def getmeasures(text, lang='en', merge=False):
 			('REL', REL_score(syllables, words, sentences)),
 			('KandelMoles', KandelMoles(syllables, words, sentences)),
 		])
-	if basicwords:
-		stats['complex_words_dc'] = complex_words_dc
+	if LANGDATA[lang].get('basicwords'):
 		readability['DaleChallIndex'] = DaleChallIndex(
 				words, complex_words_dc, sentences)
-
-		# Mesnager : Complex word count.
-		stats['complex_words_mes'] = complex_words_mes
 		readability['Mesnager'] = Mesnager(
 			complex_words_mes, words, sentences)
+	return readability
 
-	if merge:
-		readability.update(stats)
-		readability.update(wordusage)
-		readability.update(beginnings)
-		return readability
-	return collections.OrderedDict([
-			('readability grades', readability),
-			('sentence info', stats),
-			('word usage', wordusage),
-			('sentence beginnings', beginnings),
-			])
 
+class ReadabilityAccumulator(object):
+	"""Collect surface characteristics of a tokenized text incrementally.
+
+	Lines can be added as they arrive; the measures of the text seen so far
+	are available at any point.
 
-def getdataframe(filenames, lang='en', encoding='utf8', tokenizer=None):
+	>>> acc = ReadabilityAccumulator('en')
+	>>> acc.update(['A tokenized sentence .'])
+	>>> acc.update(['Another sentence .'])
+	>>> acc.snapshot()['sentence info']['words'] == 5
+	True
+
+	:param lang: a language code to select the syllabification procedure and
+		word types to count.
+	:param sketch: as for ``getmeasures()``.
+	:ivar counts: the ``ReadabilityCounts`` of the text added so far."""
+
+	def __init__(self, lang='en', sketch=None):
+		self.lang = lang
+		self.counts = ReadabilityCounts(lang, sketch)
+		self.basicwords = LANGDATA[lang].get('basicwords', frozenset())
+		self.syllcounter = getsyllabifier(lang)
+		self.scanner = getscanner(lang)
+		self.prevempty = True
+
+	def update(self, lines):
+		"""Add lines of text.
+
+		:param lines: an iterable of lines, one sentence per line of space
+			separated tokens; an empty line ends a paragraph. A paragraph may
+			continue across calls."""
+		counts = self.counts
+		search = DIRECTSPEECHRE.search
+		# words are counted in batches, so that repeated words in a batch
+		# are counted once
+		words = []
+		extend = words.extend
+		for sent in lines:
+			sent = sent.strip()
+
+			if self.prevempty and sent:
+				counts.paragraphs += 1
+			elif not sent:
+				self.prevempty = True
+				continue
+			self.prevempty = False
+
+			counts.sentences += 1
+			counts.directspeech += search(sent) is not None
+			extend(_words(sent.split()))
+			if len(words) >= WORDBATCH:
+				self._addwords(words)
+				del words[:]
+			self.scanner.scan(sent, counts.wordusage, counts.beginnings)
+		self._addwords(words)
+
+	def _updatestring(self, text, regexps=True):
+		"""Add a text given as a single string."""
+		# NB: only recognizes UNIX newlines.
+		# A single pass over the lines counts paragraphs, sentences, direct
+		# speech and words; the counts are the same as those of PARARE,
+		# SENTRE and PUNCTRE applied to the whole text.
+		counts = self.counts
+		search = DIRECTSPEECHRE.search
+		words = []
+		extend = words.extend
+		paragraphs = 1
+		sentences = directspeech = 0
+		lines = text.split('\n')
+		last = len(lines) - 1
+		prevempty = False
+		for n, line in enumerate(lines):
+			if line:
+				sentences += 1
+				directspeech += search(line) is not None
+				extend(_words(line.split()))
+				prevempty = False
+			elif 0 < n < last and not prevempty:
+				# an empty line between two newlines starts a match of PARARE
+				paragraphs += 1
+				prevempty = True
+		counts.paragraphs += paragraphs
+		counts.sentences += sentences
+		counts.directspeech += directspeech
+		self._addwords(words)
+		self.scanner.scan(text, counts.wordusage, counts.beginnings, regexps)
+
+	def updateparagraphs(self, paragraphs):
+		"""Add a text given as a sequence of pieces split at paragraph
+		breaks, or at line breaks within a paragraph.
+
+		The counts are the same as for the whole text as a single string, as
+		long as no category of word usage or sentence beginnings has a
+		match that spans more than one of the pieces.
+
+		:param paragraphs: an iterable of tuples ``(separator, paragraph)``;
+			the text is split at some of the matches of ``PARARE``, where
+			``paragraph`` is the text between two of these, which may contain
+			several paragraphs, and ``separator`` is the match preceding it
+			(an empty string for the first piece). A separator ``'\\n'`` is
+			a single newline between two non-empty lines, after which the
+			paragraph continues."""
+		counts = self.counts
+		scanner = self.scanner
+		regexps = [(counts.wordusage, scanner.wordnames[idx], regexp)
+				for idx, regexp in scanner.wordregexps] + [
+				(counts.beginnings, scanner.beginningnames[idx], regexp)
+				for idx, regexp in scanner.beginningregexps]
+		# text after the last match of each such regexp in the previous
+		# paragraph, so that matches across a paragraph break are found.
+		pending = [''] * len(regexps)
+		for separator, paragraph in paragraphs:
+			self._updatestring(paragraph, regexps=False)
+			if separator == '\n':
+				counts.paragraphs -= 1  # counted with the previous piece
+			for n, (result, name, regexp) in enumerate(regexps):
+				start = len(pending[n]) + len(separator)
+				window = pending[n] + separator + paragraph
+				end = start
+				for match in regexp.finditer(window):
+					# matches within pending were counted before
+					if match.end() > len(pending[n]):
+						result[name] += 1
+						end = max(end, match.end())
+				pending[n] = window[end:]
+
+	def wordinfo(self, token):
+		"""Return the counts of a single token that is not punctuation.
+
+		:returns: a tuple ``(characters, syllables, long_words,
+			complex_words, complex_words_dc)`` as they would be added to
+			``counts``; ``complex_words_mes`` is the same as
+			``complex_words_dc``."""
+		syll = self.syllcounter(token)
+		if token[0].isupper() or token.isdigit():
+			return len(token), syll, int(len(token) >= 7), 0, 0
+		return (len(token), syll, int(len(token) >= 7), int(syll >= 3),
+				int(token.lower() not in self.basicwords))
+
+	def _addwords(self, tokens):
+		"""Count a sequence of tokens that are not punctuation.
+
+		Each distinct token is counted once, and its counts are multiplied
+		by its frequency."""
+		characters = syllables = long_words = 0
+		complex_words = complex_words_dc = 0
+		counts = self.counts
+		freqs = collections.Counter(tokens)
+		wordinfo = self.wordinfo
+		for token, freq in freqs.items():
+			length, syll, long_word, complex_word, complex_word_dc = wordinfo(
+					token)
+			characters += length * freq
+			syllables += syll * freq
+			long_words += long_word * freq
+			complex_words += complex_word * freq
+			complex_words_dc += complex_word_dc * freq
+		counts.vocabulary.update(freqs)
+		counts.words += len(tokens)
+		counts.characters += characters
+		counts.syllables += syllables
+		counts.long_words += long_words
+		counts.complex_words += complex_words
+		counts.complex_words_dc += complex_words_dc
+		counts.complex_words_mes += complex_words_dc
+
+	def snapshot(self, merge=False):
+		"""Return the measures of the text added so far, or None if it does
+		not contain any words yet.
+
+		:param merge: as for ``getmeasures()``."""
+		if not self.counts.words:
+			return None
+		return self.counts.measures(merge)
+
+	def result(self, merge=False):
+		"""Return the measures of the text added so far.
+
+		:param merge: as for ``getmeasures()``.
+		:returns: the same dictionary as ``getmeasures()``."""
+		return self.counts.measures(merge)
+
+
+def getdataframe(filenames, lang='en', encoding='utf8', tokenizer=None,
+		workers=None, chunksize=1, mmap=False, stats=None, cache=None):
 	"""Return a pandas DataFrame with readability measures for a list of files.
+
+	:param workers: if given, score the files in parallel with a pool of this
+		many processes. Rows keep the order of ``filenames``; a file that
+		cannot be scored gets a row with a description of the failure in the
+		``error`` column instead of aborting the run.
+	:param tokenizer: a tokenizer command, or ``'builtin'`` for
+		``readability.tokenizer``; see ``applytokenizer()``.
+	:param chunksize: the number of files sent to a worker process at a time.
+	:param mmap: if ``True``, read files paragraph by paragraph from a memory
+		map; see ``readability.filestream``. Cannot be combined with a
+		tokenizer.
+	:param stats: if given, a ``readability.instrument.Stats`` object to
+		which the totals of all files are added, including those scored by
+		worker processes.
+	:param cache: if given, a ``readability.cache.ResultCache`` or the name
+		of its directory; files with a result in the cache are not scored
+		again, and the results of other files are added to it.
 	"""
 	import pandas
+	if mmap and tokenizer is not None:
+		raise ValueError('mmap cannot be combined with a tokenizer.')
 	filenames = list(filenames)
-
-	return pandas.DataFrame([getmeasures(
-				applytokenizer(name, tokenizer, encoding),
-				lang=lang,
-				merge=True)
-			for name in filenames], index=filenames)
+	rows = [result if error is None else {'error': error}
+			for result, error in _scorefiles(filenames, lang, encoding,
+				tokenizer, workers, chunksize, mmap, stats, cache)]
+	result = pandas.DataFrame(rows, index=filenames)
+	if 'error' in result.columns:
+		result = result[[col for col in result.columns if col != 'error']
+				+ ['error']]
+	return result
+
+
+def getcolumns(lang='en', types=False):
+	"""Return the keys of the merged result of ``getmeasures()`` for a
+	language, in order.
+
+	>>> getcolumns('en')[:3]
+	['Kincaid', 'ARI', 'Coleman-Liau']
+	>>> getcolumns('en', types=True)['words'].__name__
+	'int'
+
+	:param types: if ``True``, return an ordered dictionary with the type of
+		the value of each key: ``float`` for grades and ratios, ``int`` for
+		counts."""
+	# the keys and types do not depend on the counts, as long as there are
+	# words
+	counts = ReadabilityCounts(lang)
+	counts.words = counts.sentences = counts.paragraphs = 1
+	result = counts.measures(merge=True)
+	if types:
+		return collections.OrderedDict(
+				(key, type(value)) for key, value in result.items())
+	return list(result)
+
+
+def _initworker(cache, lexicons):
+	"""Set the result cache and the syllable lexicons of a worker process of
+	``_scorefiles()``; see ``readability.lexicon.getlexicons()``."""
+	global _workercache  # pylint: disable=global-statement
+	_workercache = cache
+	if lexicons:
+		from readability.lexicon import uselexicons
+		uselexicons(lexicons)
+
+
+def _scorefile(args):
+	"""Score a single file in a worker process; return a tuple
+	``(result, error, stats, key)`` where exactly one of the first two is
+	None, ``stats`` is None unless requested, and ``key`` is the cache key
+	under which a result that was not cached should be stored, or None.
+
+	Results are stored by the parent process, so that the size of the cache
+	is tracked in one place."""
+	filename, lang, encoding, tokenizer, mmap, withstats = args
+	stats = key = None
+	if withstats:
+		from readability.instrument import Stats
+		stats = Stats()
+	try:
+		if _workercache is not None:
+			key = _workercache.filekey(filename, lang, encoding, tokenizer)
+			result = _workercache.get(key)
+			if result is not None:
+				return result, None, stats, None
+		return _measurefile(filename, lang, encoding, tokenizer, mmap,
+				stats), None, stats, key
+	except Exception as err:  # pylint: disable=broad-except
+		return None, '%s: %s' % (type(err).__name__, err), stats, None
+
+
+def _scorefiles(filenames, lang, encoding, tokenizer, workers=None,
+		chunksize=1, mmap=False, stats=None, cache=None):
+	"""Yield a tuple ``(result, error)`` for each file, in order.
+
+	Without ``workers``, files are scored in this process and errors are
+	raised; otherwise they are scored by a pool of processes and errors are
+	recorded."""
+	if isinstance(cache, (str, unicode)):
+		from readability.cache import ResultCache
+		cache = ResultCache(cache)
+	if workers is None and tokenizer not in (None, 'builtin'):
+		# tokenize the next files in parallel while scoring this one
+		from readability.coprocess import getpool
+		keys = [None] * len(filenames)
+		if cache is not None:
+			keys = [cache.filekey(name, lang, encoding, tokenizer)
+					for name in filenames]
+		misses = [cache is None or key not in cache for key in keys]
+		texts = getpool(tokenizer, encoding).imap(
+				_readfile(name, encoding)
+				for name, miss in zip(filenames, misses) if miss)
+		for name, key, miss in zip(filenames, keys, misses):
+			if miss:
+				text = next(texts)
+				if isinstance(text, Exception):
+					raise text
+				result = getmeasures(text, lang=lang, merge=True, stats=stats)
+				if cache is not None:
+					cache.put(key, result)
+			else:
+				result = cache.get(key)
+				if result is None:  # evicted in the meantime
+					result = _measurefile(
+							name, lang, encoding, tokenizer, stats=stats)
+					cache.put(key, result)
+			yield result, None
+		return
+	elif workers is None:
+		for name in filenames:
+			yield _measurefile(
+					name, lang, encoding, tokenizer, mmap, stats, cache), None
+		return
+	import multiprocessing
+	from readability.lexicon import getlexicons
+	pool = multiprocessing.Pool(workers, initializer=_initworker,
+			initargs=(cache, getlexicons()))
+	try:
+		for item in pool.imap(_scorefile,
+				[(name, lang, encoding, tokenizer, mmap, stats is not None)
+					for name in filenames],
+				chunksize):
+			result, error, filestats, key = item
+			if filestats is not None:
+				stats.merge(filestats)
+			if key is not None:
+				cache.put(key, result)
+			yield result, error
+		pool.close()
+	finally:
+		pool.terminate()
+		pool.join()
+
+
+def _measurefile(filename, lang, encoding, tokenizer, mmap=False, stats=None,
+		cache=None):
+	"""Return the merged measures of a single file."""
+	if cache is not None:
+		key = cache.filekey(filename, lang, encoding, tokenizer)
+		result = cache.get(key)
+		if result is None:
+			result = _measurefile(
+					filename, lang, encoding, tokenizer, mmap, stats)
+			cache.put(key, result)
+		return result
+	if mmap:
+		from readability.filestream import getfilemeasures
+		return getfilemeasures(
+				filename, lang, encoding, merge=True, stats=stats)
+	return getmeasures(
+			applytokenizer(filename, tokenizer, encoding, lang),
+			lang=lang,
+			merge=True,
+			stats=stats)
+
+
+def _words(tokens):
+	"""Return the tokens that are not punctuation, i.e., do not match
+	``PUNCTRE``."""
+	return itertools.compress(tokens,
+			map(str.strip, tokens, itertools.repeat(PUNCTCHARS)))
+
+
+def applytokenizer(filename, tokenizer, encoding, lang='en'):
+	"""Run the tokenizer command on a file, if given, and return text.
+
+	The tokenizer is kept running for subsequent files; see
+	``readability.coprocess``. If ``tokenizer`` is ``'builtin'``, return a
+	generator of the sentences of the file tokenized by
+	``readability.tokenizer``."""
+	if tokenizer is None:
+		return _readfile(filename, encoding)
+	elif tokenizer == 'builtin':
+		from readability.tokenizer import tokenize
+		return tokenize(_readfile(filename, encoding), lang)
+	from readability.coprocess import getpool
+	return getpool(tokenizer, encoding).tokenize(_readfile(filename, encoding))
 
 
-def applytokenizer(filename, tokenizer, encoding):
-	"""Run the tokenizer command on a file, if given, and return text."""
-	if tokenizer is None:
-		return io.open(filename, encoding=encoding).read()
-	proc = subprocess.Popen(
-			tokenizer.split(),
-			stdin=subprocess.PIPE,
-			stdout=subprocess.PIPE,
-			stderr=subprocess.PIPE)
-	out, _err = proc.communicate(open(filename).read())
-	return out.decode(encoding)
+def _readfile(filename, encoding):
+	"""Return the contents of a file."""
+	with io.open(filename, encoding=encoding) as inp:
+		return inp.read()
 
 
 def KincaidGradeLevel(syllables, words, sentences):
@@ -315,7 +832,8 @@ def Mesnager(complex_words_mes, words, sentences):
 
 def main():
 	shortoptions = 'hL:'
-	options = 'help csv lang= tokenizer='.split()
+	options = ('help csv jsonl arrow parquet jobs= lang= lexicon= mmap '
+			'tokenizer= serve host= port= stats= cache= cachesize=').split()
 	cmd = os.path.basename(sys.argv[0])
 	usage = __doc__ % dict(cmd=cmd, lang=', '.join(LANGDATA))
 	try:
@@ -326,31 +844,83 @@ def main():
 	opts = dict(opts)
 	lang = opts.get('--lang', opts.get('-L', 'en'))
 
+	if '--lexicon' in opts:
+		from readability.lexicon import uselexicon
+		uselexicon(opts['--lexicon'], lang)
+	stats = None
+	if '--stats' in opts:
+		from readability.instrument import Stats
+		stats = Stats()
+
 	if '--help' in opts or '-h' in opts:
 		print(usage)
 		return
-	elif '--csv' in opts:
-		result = getdataframe(args, lang=lang,
-				tokenizer=opts.get('--tokenizer'))
-		result.to_csv(sys.stdout)
+	elif '--serve' in opts:
+		from readability.server import serve
+		jobs = opts.get('--jobs')
+		serve(opts.get('--host', '127.0.0.1'), int(opts.get('--port', 8000)),
+				lang=lang, workers=int(jobs) if jobs else None)
+		return
+	elif any(a in opts for a in ('--csv', '--jsonl', '--arrow', '--parquet')):
+		from readability.output import writemeasures
+		fmt = [a for a in ('csv', 'jsonl', 'arrow', 'parquet')
+				if '--' + a in opts][0]
+		jobs = opts.get('--jobs')
+		cache = None
+		if '--cache' in opts:
+			from readability.cache import ResultCache
+			cachesize = opts.get('--cachesize')
+			cache = ResultCache(opts['--cache'],
+					int(float(cachesize) * 2 ** 20) if cachesize else None)
+		writemeasures(args,
+				sys.stdout if fmt in ('csv', 'jsonl') else sys.stdout.buffer,
+				fmt,
+				lang=lang,
+				tokenizer=opts.get('--tokenizer'),
+				workers=int(jobs) if jobs else None,
+				mmap='--mmap' in opts,
+				stats=stats,
+				cache=cache)
+		_writestats(stats, opts)
 		return
 	elif len(args) == 0 or args == ['-']:
 		text = io.TextIOWrapper(sys.stdin.buffer, encoding='utf8')
+		if opts.get('--tokenizer') == 'builtin':
+			from readability.tokenizer import tokenize
+			text = tokenize(text, lang)
+	elif len(args) == 1 and '--mmap' in opts:
+		if '--tokenizer' in opts:
+			raise ValueError('--mmap cannot be combined with --tokenizer.')
+		text = None  # read below, paragraph by paragraph
 	elif len(args) == 1:
-		text = applytokenizer(args[0], opts.get('--tokenizer'), 'utf8')
+		text = applytokenizer(args[0], opts.get('--tokenizer'), 'utf8', lang)
 	else:
 		raise ValueError('expected 0 or 1 file argument.')
 	try:
-		for cat, data in getmeasures(text, lang).items():
+		if text is None:
+			from readability.filestream import getfilemeasures
+			result = getfilemeasures(args[0], lang, stats=stats)
+		else:
+			result = getmeasures(text, lang, stats=stats)
+		for cat, data in result.items():
 			print('%s:' % cat)
 			for key, val in data.items():
 				print(('    %-25s %12.2f' % (key + ':', val)
 						).rstrip('0 ').rstrip('.'))
 	except KeyboardInterrupt:
 		sys.exit(1)
+	_writestats(stats, opts)
+
+
+def _writestats(stats, opts):
+	"""Write the totals of --stats as JSON."""
+	if stats is not None:
+		with io.open(opts['--stats'], 'w', encoding='utf8') as out:
+			out.write(unicode(json.dumps(stats.todict(), indent=1)))
 
 
-__all__ = ['getmeasures', 'getdataframe']
+__all__ = ['getmeasures', 'getcounts', 'getdataframe', 'getgrades',
+		'getcolumns', 'ReadabilityCounts', 'ReadabilityAccumulator']
 
 if __name__ == "__main__":
 	main()
@@ -0,0 +1,161 @@
+"""Score texts from asyncio code without blocking the event loop.
+
+The counting is done by an executor: the default executor of the event loop,
+or a given ``concurrent.futures`` executor; with a ``ProcessPoolExecutor``,
+texts are scored in parallel. Texts may also be given as async iterables of
+lines, e.g., the body of a request as it arrives, which are counted in
+batches while they are read.
+
+>>> import asyncio
+>>> async def lines():
+...		for line in ['A tokenized sentence .', 'Another sentence .']:
+...			yield line
+>>> result = asyncio.run(agetmeasures(lines()))
+>>> result['sentence info']['words']
+5
+"""
+
+from __future__ import unicode_literals
+import os
+import asyncio
+import threading
+import functools
+from readability import PARARE, getcounts, ReadabilityAccumulator
+
+BATCHSIZE = 1000  # lines of an async iterable counted at a time
+PIECESIZE = 65536  # characters of a string counted at a time
+
+
+async def agetmeasures(text, lang='en', merge=False, sketch=None,
+		executor=None):
+	"""Collect surface characteristics of a tokenized text.
+
+	When the coroutine is cancelled, a text that is being counted in a
+	thread stops at the next piece of about ``PIECESIZE`` characters.
+
+	:param text: a unicode string, an iterable of lines, or an async
+		iterable of lines.
+	:param executor: a ``concurrent.futures`` executor for the counting; by
+		default, the default executor of the event loop.
+	:param lang, merge, sketch: as for ``getmeasures()``.
+	:returns: the same dictionary as ``getmeasures()``."""
+	counts = await agetcounts(text, lang, sketch, executor)
+	return counts.measures(merge)
+
+
+async def agetcounts(text, lang='en', sketch=None, executor=None):
+	"""Collect the raw counts of a tokenized text; parameters as for
+	``agetmeasures()``.
+
+	:returns: a ``ReadabilityCounts`` object."""
+	loop = asyncio.get_running_loop()
+	if hasattr(text, '__aiter__'):
+		return await _acountlines(text, lang, sketch, executor)
+	elif not isinstance(text, str):
+		return await loop.run_in_executor(
+				executor, getcounts, text, lang, sketch)
+	cancelled = None if _isprocesspool(executor) else threading.Event()
+	try:
+		return await loop.run_in_executor(executor, functools.partial(
+				_countstring, text, lang, sketch, cancelled))
+	except asyncio.CancelledError:
+		if cancelled is not None:
+			cancelled.set()
+		raise
+
+
+async def agetmeasures_batch(texts, lang='en', merge=False, sketch=None,
+		executor=None, limit=None):
+	"""Score a number of texts concurrently.
+
+	When the coroutine is cancelled, texts that have not been counted yet are
+	cancelled as well.
+
+	:param texts: an iterable or async iterable of texts, each of which may
+		be of any type accepted by ``agetmeasures()``.
+	:param limit: the maximum number of texts that are counted at the same
+		time; default: the number of CPUs.
+	:returns: a list with the result of ``getmeasures()`` for each text."""
+	semaphore = asyncio.Semaphore(limit or os.cpu_count() or 1)
+
+	async def score(text):
+		async with semaphore:
+			return await agetmeasures(text, lang, merge, sketch, executor)
+
+	tasks = []
+	try:
+		if hasattr(texts, '__aiter__'):
+			async for text in texts:
+				tasks.append(asyncio.ensure_future(score(text)))
+		else:
+			for text in texts:
+				tasks.append(asyncio.ensure_future(score(text)))
+		return await asyncio.gather(*tasks)
+	except BaseException:
+		for task in tasks:
+			task.cancel()
+		raise
+
+
+async def _acountlines(lines, lang, sketch, executor):
+	"""Count an async iterable of lines in batches."""
+	loop = asyncio.get_running_loop()
+	counts = None
+	prevempty = True
+	batch = []
+	async for line in lines:
+		batch.append(line)
+		if len(batch) >= BATCHSIZE:
+			counts = _mergebatch(counts, prevempty, await loop.run_in_executor(
+					executor, getcounts, batch, lang, sketch), batch)
+			prevempty = not batch[-1].strip()
+			batch = []
+	counts = _mergebatch(counts, prevempty, await loop.run_in_executor(
+			executor, getcounts, batch, lang, sketch), batch)
+	return counts
+
+
+def _mergebatch(counts, prevempty, batchcounts, batch):
+	"""Add the counts of a batch of lines to those of the previous lines."""
+	if counts is None:
+		return batchcounts
+	# a paragraph continued from the previous batch was counted twice
+	if not prevempty and batch and batch[0].strip():
+		batchcounts.paragraphs -= 1
+	return counts.merge(batchcounts)
+
+
+def _countstring(text, lang, sketch, cancelled=None):
+	"""Count a string piece by piece; stop if ``cancelled`` is set."""
+	acc = ReadabilityAccumulator(lang, sketch)
+	acc.updateparagraphs(_pieces(text, cancelled))
+	return acc.counts
+
+
+def _pieces(text, cancelled):
+	"""Split a string at paragraph breaks into pieces of at least
+	``PIECESIZE`` characters, as expected by
+	``ReadabilityAccumulator.updateparagraphs()``."""
+	pos = 0
+	separator = ''
+	while True:
+		if cancelled is not None and cancelled.is_set():
+			raise asyncio.CancelledError
+		match = PARARE.search(text, pos + PIECESIZE)
+		if match is None:
+			yield separator, text[pos:]
+			return
+		start = match.start()
+		while start > pos and text[start - 1] == '\n':
+			start -= 1  # the search may start within a paragraph break
+		yield separator, text[pos:start]
+		separator, pos = text[start:match.end()], match.end()
+
+
+def _isprocesspool(executor):
+	"""Test whether an executor runs functions in other processes."""
+	from concurrent.futures import ProcessPoolExecutor
+	return isinstance(executor, ProcessPoolExecutor)
+
+
+__all__ = ['agetmeasures', 'agetcounts', 'agetmeasures_batch']
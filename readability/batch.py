@@ -0,0 +1,125 @@
+"""Score many texts at once with vectorized formulas.
+
+The raw counts of each text are collected into NumPy arrays, after which every
+readability formula is evaluated once over all texts. Requires NumPy."""
+
+from __future__ import division, unicode_literals
+import collections
+from readability import (getcounts, ReadabilityCounts, KincaidGradeLevel, ARI,
+		ColemanLiauIndex, FleschReadingEase, GunningFogIndex, LIX, RIX,
+		REL_score, KandelMoles, Mesnager)
+from readability.langdata import LANGDATA
+
+
+def getmeasures_batch(texts, lang='en', merge=False):
+	"""Collect surface characteristics of a sequence of tokenized texts.
+
+	>>> result = getmeasures_batch(['A tokenized sentence .',
+	...		'Another sentence .\\nAnd a third .'])
+	>>> result['sentence info']['words'].tolist()
+	[3, 5]
+
+	:param texts: an iterable of texts; each a unicode string or an iterable
+		of lines, as for ``getmeasures()``.
+	:param lang: a language code.
+	:param merge: if ``True``, return a single dictionary of columns.
+	:returns: a two-level ordered dictionary with the same keys as the result
+		of ``getmeasures()``, with as values NumPy arrays holding the value
+		for each text. The measures of a text without words are NaN."""
+	import numpy
+	wordnames = list(LANGDATA[lang]['words'])
+	beginningnames = list(LANGDATA[lang]['beginnings'])
+	fields = ReadabilityCounts.FIELDS + ('wordtypes', )
+	rows = []
+	for text in texts:
+		counts = getcounts(text, lang)
+		rows.append([getattr(counts, field) for field in fields[:-1]]
+				+ [len(counts.vocabulary)]
+				+ list(counts.wordusage.values())
+				+ list(counts.beginnings.values()))
+	data = numpy.array(rows, dtype=numpy.int64).reshape(
+			len(rows), len(fields) + len(wordnames) + len(beginningnames))
+	col = dict(zip(fields, data.T))
+	characters = col['characters']
+	syllables = col['syllables']
+	words = col['words']
+	sentences = col['sentences']
+	complex_words = col['complex_words']
+	long_words = col['long_words']
+	offset = len(fields)
+
+	with numpy.errstate(divide='ignore', invalid='ignore'):
+		stats = collections.OrderedDict([
+				('characters_per_word', characters / words),
+				('syll_per_word', syllables / words),
+				('words_per_sentence', words / sentences),
+				('sentences_per_paragraph', sentences / col['paragraphs']),
+				('type_token_ratio', col['wordtypes'] / words),
+				('directspeech_ratio', col['directspeech'] / sentences),
+				('characters', characters),
+				('syllables', syllables),
+				('words', words),
+				('wordtypes', col['wordtypes']),
+				('sentences', sentences),
+				('paragraphs', col['paragraphs']),
+				('long_words', long_words),
+				('complex_words', complex_words),
+			])
+		readability = collections.OrderedDict([
+				('Kincaid', KincaidGradeLevel(syllables, words, sentences)),
+				('ARI', ARI(characters, words, sentences)),
+				('Coleman-Liau',
+					ColemanLiauIndex(characters, words, sentences)),
+				('FleschReadingEase',
+					FleschReadingEase(syllables, words, sentences)),
+				('GunningFogIndex',
+					GunningFogIndex(words, complex_words, sentences)),
+				('LIX', LIX(words, long_words, sentences)),
+				('SMOGIndex', _SMOGIndex(complex_words, sentences)),
+				('RIX', RIX(long_words, sentences)),
+				('REL', REL_score(syllables, words, sentences)),
+				('KandelMoles', KandelMoles(syllables, words, sentences)),
+			])
+		if LANGDATA[lang].get('basicwords'):
+			stats['complex_words_dc'] = col['complex_words_dc']
+			readability['DaleChallIndex'] = _DaleChallIndex(
+					words, col['complex_words_dc'], sentences)
+			stats['complex_words_mes'] = col['complex_words_mes']
+			readability['Mesnager'] = Mesnager(
+					col['complex_words_mes'], words, sentences)
+	empty = words == 0
+	for column in list(readability.values()) + list(stats.values())[:6]:
+		column[empty] = numpy.nan
+	wordusage = collections.OrderedDict(zip(
+			wordnames, data.T[offset:offset + len(wordnames)]))
+	beginnings = collections.OrderedDict(zip(
+			beginningnames, data.T[offset + len(wordnames):]))
+
+	if merge:
+		readability.update(stats)
+		readability.update(wordusage)
+		readability.update(beginnings)
+		return readability
+	return collections.OrderedDict([
+			('readability grades', readability),
+			('sentence info', stats),
+			('word usage', wordusage),
+			('sentence beginnings', beginnings),
+			])
+
+
+def _SMOGIndex(complex_words, sentences):
+	"""Vectorized version of ``SMOGIndex()``."""
+	import numpy
+	return numpy.sqrt(complex_words * (30 / sentences)) + 3
+
+
+def _DaleChallIndex(words, complex_words_dc, sentences):
+	"""Vectorized version of ``DaleChallIndex()``."""
+	import numpy
+	complex_prc = complex_words_dc / words * 100
+	score = 0.1579 * complex_prc + 0.0496 * words / sentences
+	return score + numpy.where(complex_prc <= 5, 3.6365, 0.0)
+
+
+__all__ = ['getmeasures_batch']
@@ -0,0 +1,168 @@
+"""A content-addressed cache of results on disk.
+
+Results of files are stored under a hash of the contents of the file, the
+language, encoding, tokenizer command, syllable lexicon and the version of
+this package, so that files that have not changed are not scored again::
+
+	$ readability --csv --cache=~/.cache/readability */*.txt >measures.csv
+
+Entries are written atomically, so the cache can be shared by parallel
+worker processes and concurrent runs. When a size limit is given, the least
+recently used entries are removed when it is exceeded.
+
+>>> import tempfile
+>>> cache = ResultCache(tempfile.mkdtemp())
+>>> key = cache.key(b'A tokenized sentence .', 'en')
+>>> cache.get(key) is None
+True
+>>> cache.put(key, {'words': 3})
+>>> cache.get(key)['words']
+3
+"""
+
+from __future__ import unicode_literals
+import io
+import os
+import json
+import errno
+import hashlib
+import tempfile
+import collections
+from readability import __version__
+from readability.langdata import LANGDATA
+
+BLOCKSIZE = 1 << 20  # bytes read at a time when hashing a file
+
+
+class ResultCache(object):
+	"""A directory with a JSON file for each result.
+
+	:param directory: the directory of the cache; created if it does not
+		exist.
+	:param maxsize: if given, the maximum total size of the entries in
+		bytes; when it is exceeded, the least recently used entries are
+		removed until the size is 90% of it."""
+
+	def __init__(self, directory, maxsize=None):
+		self.directory = os.path.expanduser(directory)
+		self.maxsize = maxsize
+		self.size = None  # estimated total size; computed when needed
+		self.hits = self.misses = 0
+		_makedirs(self.directory)
+
+	def key(self, data, lang, encoding='utf8', tokenizer=None):
+		"""Return the key of a text given as bytes."""
+		return self._key(lang, encoding, tokenizer, [data])
+
+	def filekey(self, filename, lang, encoding='utf8', tokenizer=None):
+		"""Return the key of the contents of a file."""
+		with io.open(filename, 'rb') as inp:
+			return self._key(lang, encoding, tokenizer,
+					iter(lambda: inp.read(BLOCKSIZE), b''))
+
+	def get(self, key):
+		"""Return the cached result for ``key``, or None."""
+		path = self._path(key)
+		try:
+			with io.open(path, encoding='utf8') as inp:
+				result = json.load(
+						inp, object_pairs_hook=collections.OrderedDict)
+		except (IOError, OSError, ValueError):
+			# missing, removed by another process, or truncated by a crash
+			self.misses += 1
+			return None
+		try:
+			os.utime(path, None)  # mark as recently used
+		except OSError:
+			pass
+		self.hits += 1
+		return result
+
+	def __contains__(self, key):
+		return os.path.exists(self._path(key))
+
+	def put(self, key, result):
+		"""Store a result, which should be serializable as JSON."""
+		path = self._path(key)
+		_makedirs(os.path.dirname(path))
+		data = json.dumps(result).encode('utf8')
+		fd, tmp = tempfile.mkstemp(
+				dir=os.path.dirname(path), prefix='.', suffix='.tmp')
+		try:
+			with os.fdopen(fd, 'wb') as out:
+				out.write(data)
+			os.replace(tmp, path)
+		except BaseException:
+			_remove(tmp)
+			raise
+		if self.maxsize is not None:
+			if self.size is None:
+				self.size = sum(size for _, size, _ in self._entries())
+			else:
+				self.size += len(data)
+			if self.size > self.maxsize:
+				self.evict()
+
+	def evict(self, target=None):
+		"""Remove the least recently used entries until the total size is at
+		most ``target`` bytes; default: 90% of ``maxsize``."""
+		if target is None:
+			target = 0.9 * self.maxsize
+		entries = sorted(self._entries())
+		total = sum(size for _, size, _ in entries)
+		for _, size, path in entries:
+			if total <= target:
+				break
+			_remove(path)
+			total -= size
+		self.size = total
+
+	def clear(self):
+		"""Remove all entries."""
+		self.evict(0)
+
+	def _entries(self):
+		"""Yield a tuple ``(mtime, size, path)`` for each entry."""
+		for root, _, files in os.walk(self.directory):
+			for name in files:
+				if name.endswith('.json'):
+					path = os.path.join(root, name)
+					try:
+						stat = os.stat(path)
+					except OSError:
+						continue
+					yield stat.st_mtime, stat.st_size, path
+
+	def _key(self, lang, encoding, tokenizer, blocks):
+		lexicon = getattr(LANGDATA[lang].get('syllables'), 'lexicon', None)
+		digest = hashlib.sha256(json.dumps([
+				__version__, lang, encoding, tokenizer,
+				lexicon and lexicon.digest]).encode('utf8'))
+		for block in blocks:
+			digest.update(block)
+		return digest.hexdigest()
+
+	def _path(self, key):
+		return os.path.join(self.directory, key[:2], key[2:] + '.json')
+
+	def __repr__(self):
+		return '%s(%r, maxsize=%r)' % (
+				self.__class__.__name__, self.directory, self.maxsize)
+
+
+def _makedirs(directory):
+	try:
+		os.makedirs(directory)
+	except OSError as err:
+		if err.errno != errno.EEXIST:
+			raise
+
+
+def _remove(path):
+	try:
+		os.remove(path)
+	except OSError:
+		pass
+
+
+__all__ = ['ResultCache']
@@ -0,0 +1,338 @@
+"""Long-lived tokenizer processes.
+
+Starting an external tokenizer for every document is slow when the tokenizer
+has to load a model first. A ``Coprocess`` keeps a tokenizer running and sends
+it one document at a time over its standard input, using a framed protocol:
+each document is followed by an empty line and a delimiter line with a unique
+word. The output up to the line with the delimiter, without leading and
+trailing empty lines, is the tokenized document. This works with any
+tokenizer that reads its input line by line, keeps the delimiter word intact,
+and flushes its output (e.g., by running it with ``stdbuf -oL``). When a
+tokenizer produces no output for ``TIMEOUT`` seconds, or ``STARTTIMEOUT``
+seconds for the first document, which includes loading a model, it is assumed
+to buffer its output; it is stopped, and from then on the coprocess, or the
+``TokenizerPool`` it belongs to, runs the command once for each document.
+
+A ``TokenizerPool`` manages several coprocesses for the same command, which
+can be used by multiple threads at the same time. A coprocess that exits or
+breaks the protocol is restarted."""
+
+from __future__ import unicode_literals
+import os
+import uuid
+import queue
+import atexit
+import select
+import threading
+import subprocess
+import collections
+
+TIMEOUT = 10  # seconds without output after which a tokenizer is stopped
+STARTTIMEOUT = 120  # the same, for the first document after a start
+BUFSIZE = 65536  # bytes read from a tokenizer at a time
+MAXSTDERR = 1 << 20  # bytes of error output after which it is discarded
+_pools = {}
+_lock = threading.Lock()
+
+
+class CoprocessError(RuntimeError):
+	"""Raised when a tokenizer fails twice on the same document."""
+
+
+class CoprocessTimeout(CoprocessError):
+	"""Raised when a tokenizer produces no output for too long."""
+
+
+class Coprocess(object):
+	"""A tokenizer process that tokenizes one document at a time.
+
+	>>> with Coprocess('cat') as proc:
+	...		print(proc.tokenize('One sentence .\\nAnother one .'))
+	One sentence .
+	Another one .
+	<BLANKLINE>
+
+	:param command: the tokenizer command with its options.
+	:param encoding: the encoding of the input and output of the tokenizer.
+	:param timeout: the number of seconds to wait for output of the
+		tokenizer, or None to wait indefinitely.
+	:param starttimeout: the same, for the first document after the
+		tokenizer is started.
+	:ivar oneshot: whether the command is run once for each document,
+		after the tokenizer timed out."""
+
+	def __init__(self, command, encoding='utf8', timeout=TIMEOUT,
+			starttimeout=STARTTIMEOUT):
+		self.command = command
+		self.encoding = encoding
+		self.timeout = timeout
+		self.starttimeout = starttimeout
+		self.delimiter = 'READABILITYEOD%s' % uuid.uuid4().hex
+		self.proc = self.stderr = None
+		self.restarts = -1
+		self.oneshot = False
+		self.warm = False  # whether a document was tokenized since the start
+		self._rest = b''  # output after the last delimiter line
+
+	def start(self):
+		"""(Re)start the tokenizer process."""
+		self.close()
+		import tempfile
+		self.stderr = tempfile.TemporaryFile()
+		try:
+			self.proc = subprocess.Popen(
+					self.command.split(),
+					stdin=subprocess.PIPE,
+					stdout=subprocess.PIPE,
+					stderr=self.stderr)
+		except BaseException:
+			self.stderr.close()
+			self.stderr = None
+			raise
+		self.warm = False
+		self.restarts += 1
+
+	def close(self):
+		"""Stop the tokenizer process, if it is running."""
+		if self.proc is None:
+			return
+		try:
+			self.proc.stdin.close()
+		except (IOError, OSError):
+			pass
+		try:
+			self.proc.wait(timeout=5)
+		except subprocess.TimeoutExpired:
+			self.proc.kill()
+			self.proc.wait()
+		self.proc.stdout.close()
+		self.stderr.close()
+		self.proc = self.stderr = None
+		self._rest = b''
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+	def tokenize(self, text):
+		"""Return the tokenized text; the result ends with a newline.
+
+		If the process fails, it is restarted and the document is sent again;
+		if that fails as well, ``CoprocessError`` is raised. If the process
+		times out, the command is run once for this and later documents."""
+		if self.oneshot:
+			self.close()
+			return self._communicate(text)
+		try:
+			return self._tokenize(text)
+		except CoprocessTimeout:
+			self.close()
+			self.oneshot = True
+			return self._communicate(text)
+		except (IOError, OSError, CoprocessError):
+			pass
+		try:
+			return self._tokenize(text)
+		except (IOError, OSError, CoprocessError) as err:
+			message = ''
+			if self.stderr is not None:
+				self.stderr.seek(0)
+				message = self.stderr.read()[-1000:].decode(
+						self.encoding, 'replace').strip()
+			self.close()
+			raise CoprocessError('tokenizer %r failed: %s%s' % (
+					self.command, err, '\n' + message if message else ''))
+
+	def _tokenize(self, text):
+		if self.proc is None or self.proc.poll() is not None:
+			self.start()
+		elif os.fstat(self.stderr.fileno()).st_size > MAXSTDERR:
+			# the error output is only shown when a document fails
+			self.stderr.seek(0)
+			self.stderr.truncate()
+		data = ('%s\n\n%s\n' % (text.rstrip('\n'), self.delimiter)
+				).encode(self.encoding)
+		errors = []
+
+		def write():
+			# write from a separate thread, since the tokenizer may fill the
+			# output pipe before it has read the whole document.
+			try:
+				self.proc.stdin.write(data)
+				self.proc.stdin.flush()
+			except (IOError, OSError) as err:
+				errors.append(err)
+
+		writer = threading.Thread(target=write)
+		writer.daemon = True
+		writer.start()
+		try:
+			output = self._read()
+		except CoprocessError:
+			self.proc.kill()
+			self.proc.wait()
+			writer.join()
+			raise
+		writer.join()
+		if errors:
+			raise errors[0]
+		self.warm = True
+		return output.decode(self.encoding).strip('\n') + '\n'
+
+	def _read(self):
+		"""Read the output of the tokenizer up to the delimiter line."""
+		delimiter = self.delimiter.encode('ascii')
+		fd = self.proc.stdout.fileno()
+		lines = []
+		data = self._rest
+		timeout = self.timeout if self.warm else self.starttimeout
+		while True:
+			start = 0
+			end = data.find(b'\n')
+			while end != -1:
+				line = data[start:end + 1]
+				start = end + 1
+				if line.strip() == delimiter:
+					self._rest = data[start:]
+					return b''.join(lines)
+				lines.append(line)
+				end = data.find(b'\n', start)
+			data = data[start:]
+			if not select.select([fd], [], [], timeout)[0]:
+				raise CoprocessTimeout('no output for %s seconds' % timeout)
+			chunk = os.read(fd, BUFSIZE)
+			if not chunk:
+				raise CoprocessError('process exited with code %s before the '
+						'end of the document' % self.proc.wait())
+			data += chunk
+
+	def _communicate(self, text):
+		"""Run the command once for a single document."""
+		proc = subprocess.Popen(
+				self.command.split(),
+				stdin=subprocess.PIPE,
+				stdout=subprocess.PIPE,
+				stderr=subprocess.PIPE)
+		out, err = proc.communicate(text.encode(self.encoding))
+		if proc.returncode:
+			raise CoprocessError('tokenizer %r exited with code %s%s' % (
+					self.command, proc.returncode,
+					'\n' + err[-1000:].decode(self.encoding, 'replace').strip()
+					if err.strip() else ''))
+		return out.decode(self.encoding).strip('\n') + '\n'
+
+
+class TokenizerPool(object):
+	"""A pool of tokenizer processes for the same command.
+
+	Processes are started when needed, up to ``size``, and are reused for
+	subsequent documents. When one of them times out, all of them run the
+	command once for each document.
+
+	>>> with TokenizerPool('cat', size=2) as pool:
+	...		list(pool.imap(['a .', 'b .', 'c .']))
+	['a .\\n', 'b .\\n', 'c .\\n']
+
+	:param command: the tokenizer command with its options.
+	:param encoding: the encoding of the input and output of the tokenizer.
+	:param size: the maximum number of processes; default: the number of
+		CPUs.
+	:param timeout, starttimeout: as for ``Coprocess``."""
+
+	def __init__(self, command, encoding='utf8', size=None, timeout=TIMEOUT,
+			starttimeout=STARTTIMEOUT):
+		self.command = command
+		self.encoding = encoding
+		self.timeout = timeout
+		self.starttimeout = starttimeout
+		self.oneshot = False
+		self.size = size or os.cpu_count() or 1
+		self.started = 0
+		self.idle = queue.LifoQueue()
+		self._lock = threading.Lock()
+		self._procs = []
+
+	def _acquire(self):
+		try:
+			return self.idle.get_nowait()
+		except queue.Empty:
+			pass
+		with self._lock:
+			if self.started < self.size:
+				self.started += 1
+				proc = Coprocess(self.command, self.encoding,
+						self.timeout, self.starttimeout)
+				self._procs.append(proc)
+				return proc
+		return self.idle.get()
+
+	def tokenize(self, text):
+		"""Tokenize a document with an idle process from the pool."""
+		proc = self._acquire()
+		proc.oneshot |= self.oneshot
+		try:
+			return proc.tokenize(text)
+		finally:
+			self.oneshot |= proc.oneshot
+			self.idle.put(proc)
+
+	def imap(self, texts):
+		"""Tokenize an iterable of documents with up to ``size`` processes
+		in parallel; yield the results in order. A result is an exception
+		instance if the tokenizer failed on that document."""
+		from concurrent.futures import ThreadPoolExecutor
+
+		def tokenize(text):
+			try:
+				return self.tokenize(text)
+			except Exception as err:  # pylint: disable=broad-except
+				return err
+
+		pending = collections.deque()
+		with ThreadPoolExecutor(self.size) as executor:
+			for text in texts:
+				pending.append(executor.submit(tokenize, text))
+				if len(pending) >= self.size:
+					yield pending.popleft().result()
+			while pending:
+				yield pending.popleft().result()
+
+	def stats(self):
+		"""Return the number of started processes and of restarts."""
+		with self._lock:
+			return dict(processes=self.started, restarts=sum(
+					max(proc.restarts, 0) for proc in self._procs))
+
+	def close(self):
+		"""Stop all processes."""
+		with self._lock:
+			for proc in self._procs:
+				proc.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+
+def getpool(command, encoding='utf8'):
+	"""Return the shared ``TokenizerPool`` of this process for a command."""
+	# a forked worker process must not share the pipes of its parent
+	key = (command, encoding, os.getpid())
+	with _lock:
+		if key not in _pools:
+			_pools[key] = TokenizerPool(command, encoding)
+		return _pools[key]
+
+
+@atexit.register
+def _closepools():
+	for pool in _pools.values():
+		pool.close()
+
+
+__all__ = ['Coprocess', 'CoprocessError', 'CoprocessTimeout', 'TokenizerPool',
+		'getpool']
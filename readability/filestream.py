@@ -0,0 +1,101 @@
+"""Score large files without reading them into memory.
+
+The file is memory-mapped and decoded block by block; each block is counted
+up to its last paragraph break, or its last line break if it has no paragraph
+break, and the rest is carried over to the next.
+The result is the same as that of ``getmeasures()`` on the contents of the
+file read as a single string, while memory use does not depend on the size of
+the file, apart from the vocabulary (see the ``sketch`` option of
+``getmeasures()``)."""
+
+from __future__ import unicode_literals
+import io
+import mmap
+import codecs
+from readability import PARARE, ReadabilityAccumulator
+
+BLOCKSIZE = 1 << 20
+
+
+def iterparagraphs(filename, encoding='utf8', blocksize=BLOCKSIZE):
+	"""Yield the text of a file in pieces that end at paragraph breaks.
+
+	As when the file is opened in text mode, universal newlines are
+	translated to ``\\n``. A piece usually contains about ``blocksize``
+	bytes of text; when a block has no paragraph break, the piece ends at
+	the last line break instead, so that a file without empty lines is not
+	read into memory as a whole.
+
+	:yields: tuples ``(separator, paragraph)`` as expected by
+		``ReadabilityAccumulator.updateparagraphs()``."""
+	decoder = io.IncrementalNewlineDecoder(
+			codecs.getincrementaldecoder(encoding)(), translate=True)
+	with io.open(filename, 'rb') as inp:
+		try:
+			data = mmap.mmap(inp.fileno(), 0, access=mmap.ACCESS_READ)
+		except ValueError:  # an empty file cannot be mapped
+			data = b''
+		try:
+			separator, buf = '', ''
+			for offset in range(0, len(data), blocksize):
+				final = offset + blocksize >= len(data)
+				# a separator at the end of buf may continue in the next
+				# block, so search only up to the last non-newline.
+				searchfrom = len(buf.rstrip('\n'))
+				buf += decoder.decode(data[offset:offset + blocksize], final)
+				last = None
+				for match in PARARE.finditer(buf, searchfrom):
+					if match.end() == len(buf) and not final:
+						break
+					last = match
+				if last is not None:
+					yield separator, buf[:last.start()]
+					separator, buf = last.group(), buf[last.end():]
+				elif not final:
+					# a newline before the trailing newlines, if any, is not
+					# part of a paragraph break, since there is no match.
+					cut = buf.rfind('\n', 0, len(buf.rstrip('\n')))
+					if cut > 0:
+						yield separator, buf[:cut]
+						separator, buf = '\n', buf[cut + 1:]
+			if not data:
+				decoder.decode(b'', True)
+			yield separator, buf
+		finally:
+			if isinstance(data, mmap.mmap):
+				data.close()
+
+
+def getfilecounts(filename, lang='en', encoding='utf8', sketch=None,
+		blocksize=BLOCKSIZE, stats=None):
+	"""Collect the raw counts of a tokenized text file.
+
+	:param blocksize: the number of bytes decoded at a time.
+	:returns: a ``ReadabilityCounts`` object; other parameters as for
+		``getfilemeasures()``."""
+	acc = ReadabilityAccumulator(lang, sketch)
+	paragraphs = iterparagraphs(filename, encoding, blocksize)
+	if stats is not None:
+		from readability.instrument import instrument
+		with instrument(acc, stats):
+			acc.updateparagraphs(paragraphs)
+	else:
+		acc.updateparagraphs(paragraphs)
+	return acc.counts
+
+
+def getfilemeasures(filename, lang='en', encoding='utf8', merge=False,
+		sketch=None, stats=None):
+	"""Collect surface characteristics of a tokenized text file.
+
+	:param filename: a file with one sentence per line of space separated
+		tokens, and paragraphs separated by empty lines.
+	:param encoding: the encoding of the file.
+	:param lang, merge, sketch, stats: as for ``getmeasures()``.
+	:returns: the same dictionary as
+		``getmeasures(io.open(filename, encoding=encoding).read(), ...)``."""
+	return getfilecounts(filename, lang, encoding, sketch,
+			stats=stats).measures(merge)
+
+
+__all__ = ['iterparagraphs', 'getfilecounts', 'getfilemeasures']
@@ -0,0 +1,187 @@
+"""Opt-in instrumentation of the time spent in each phase of counting.
+
+Pass a ``Stats`` object as the ``stats`` argument of ``getmeasures()``,
+``getcounts()`` or ``getdataframe()`` to add the totals of each call to it.
+Without it, no timing is done at all.
+
+>>> from readability import getmeasures
+>>> stats = Stats()
+>>> _ = getmeasures('A tokenized sentence .\\nAnother sentence .', stats=stats)
+>>> stats.counters['texts'], stats.counters['tokens']
+(1, 5)
+>>> list(stats.time)
+['syllables', 'basicwords', 'words', 'scan', 'regexps', 'other']
+
+Phases:
+
+:syllables: counting syllables, including cache lookups.
+:basicwords: looking up words in the list of basic words (Dale-Chall and
+	Mesnager).
+:words: the rest of the per-token work: lengths, vocabulary, complex words.
+:scan: the single pass that counts word usage and sentence beginnings.
+:regexps: word usage and sentence beginning categories that are counted
+	with their regular expression; see ``readability.scanner``.
+:other: finding paragraphs, sentences, direct speech and tokens.
+
+The time of the phases includes the overhead of timing them, which is
+noticeable for the per-token phases."""
+
+from __future__ import division, unicode_literals
+import time
+import collections
+import contextlib
+
+PHASES = ('syllables', 'basicwords', 'words', 'scan', 'regexps', 'other')
+COUNTERS = ('texts', 'tokens', 'cache_hits', 'cache_misses')
+
+
+class Stats(object):
+	"""Totals of wall time per phase in seconds, and counters.
+
+	Stats can be added up, e.g., to combine those of worker processes.
+
+	:ivar time: an ordered dictionary with the time of each phase.
+	:ivar counters: an ordered dictionary with the number of texts, tokens
+		(excluding punctuation), and syllable cache hits and misses."""
+
+	def __init__(self):
+		self.time = collections.OrderedDict.fromkeys(PHASES, 0.0)
+		self.counters = collections.OrderedDict.fromkeys(COUNTERS, 0)
+
+	def merge(self, other):
+		"""Add the totals of another ``Stats`` object to this one; returns
+		self."""
+		for name, value in other.time.items():
+			self.time[name] = self.time.get(name, 0.0) + value
+		for name, value in other.counters.items():
+			self.counters[name] = self.counters.get(name, 0) + value
+		return self
+
+	def __iadd__(self, other):
+		return self.merge(other)
+
+	def __add__(self, other):
+		return Stats().merge(self).merge(other)
+
+	def total(self):
+		"""Return the total time of all phases."""
+		return sum(self.time.values())
+
+	def todict(self):
+		"""Return the totals as a dictionary of JSON serializable values."""
+		return collections.OrderedDict([
+				('time', collections.OrderedDict(self.time)),
+				('total', self.total()),
+				('counters', collections.OrderedDict(self.counters))])
+
+	@classmethod
+	def fromdict(cls, data):
+		"""Inverse of ``todict()``."""
+		result = cls()
+		result.time.update(data['time'])
+		result.counters.update(data['counters'])
+		return result
+
+	def __repr__(self):
+		return '%s(%s)' % (self.__class__.__name__, ', '.join(
+				'%s=%.3fs' % a for a in self.time.items()))
+
+
+class _TimedScanner(object):
+	"""Wrap a ``Scanner`` to time its single pass and its regexps."""
+
+	def __init__(self, scanner, local):
+		self.scanner = scanner
+		self.local = local
+
+	def __getattr__(self, name):
+		return getattr(self.scanner, name)
+
+	def scan(self, text, wordusage=None, beginnings=None, regexps=True):
+		scanner = self.scanner
+		start = time.perf_counter()
+		wordusage, beginnings = scanner.scan(
+				text, wordusage, beginnings, regexps=False)
+		mid = time.perf_counter()
+		self.local['scan'] += mid - start
+		if regexps:
+			for idx, regexp in scanner.wordregexps:
+				wordusage[scanner.wordnames[idx]] += sum(
+						1 for _ in regexp.finditer(text))
+			for idx, regexp in scanner.beginningregexps:
+				beginnings[scanner.beginningnames[idx]] += sum(
+						1 for _ in regexp.finditer(text))
+			self.local['regexps'] += time.perf_counter() - mid
+		return wordusage, beginnings
+
+
+class _TimedSet(object):
+	"""Wrap a set to time membership tests."""
+
+	def __init__(self, items, local):
+		self.items = items
+		self.local = local
+
+	def __contains__(self, item):
+		start = time.perf_counter()
+		result = item in self.items
+		self.local['basicwords'] += time.perf_counter() - start
+		return result
+
+	def __len__(self):
+		return len(self.items)
+
+
+@contextlib.contextmanager
+def instrument(acc, stats):
+	"""Add the work done by a ``ReadabilityAccumulator`` within the block
+	to ``stats``.
+
+	The accumulator is modified during the block and restored afterwards."""
+	local = dict.fromkeys(PHASES, 0.0)
+	syllcounter = acc.syllcounter
+	addwords = acc._addwords
+	clock = time.perf_counter
+
+	def countsyllables(word):
+		start = clock()
+		result = syllcounter(word)
+		local['syllables'] += clock() - start
+		return result
+
+	def _addwords(tokens):
+		tokens = list(tokens)
+		stats.counters['tokens'] += len(tokens)
+		start = clock()
+		addwords(tokens)
+		local['words'] += clock() - start
+
+	cache = getattr(syllcounter, 'cache', None)
+	before = cache.stats() if cache is not None else None
+	basicwords, scanner = acc.basicwords, acc.scanner
+	acc.syllcounter = countsyllables
+	acc.basicwords = _TimedSet(basicwords, local)
+	acc.scanner = _TimedScanner(scanner, local)
+	acc._addwords = _addwords
+	start = clock()
+	try:
+		yield stats
+	finally:
+		total = clock() - start
+		acc.syllcounter, acc.basicwords = syllcounter, basicwords
+		acc.scanner = scanner
+		del acc._addwords
+		# words includes the nested syllables and basicwords phases
+		local['words'] -= local['syllables'] + local['basicwords']
+		local['other'] = total - sum(local.values())
+		for name, value in local.items():
+			stats.time[name] += value
+		stats.counters['texts'] += 1
+		if before is not None:
+			after = cache.stats()
+			stats.counters['cache_hits'] += after['hits'] - before['hits']
+			stats.counters['cache_misses'] += (
+					after['misses'] - before['misses'])
+
+
+__all__ = ['Stats', 'instrument']
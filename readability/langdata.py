@@ -6,7 +6,14 @@ try:
 	import re2 as re
 except ImportError:
 	import re
+import threading
 import collections
+try:
+	from collections.abc import MutableMapping
+except ImportError:
+	from collections import MutableMapping
+from readability import syllabifier
+from readability.scanner import Scanner
 
 VOWELS = 'aoeuiäàâáåãëéèêóòöôõðùúüìíïî'  # y is special case; true for en.
 VOWELS_FR = VOWELS + 'yÿ'
@@ -75,7 +82,6 @@ greyish 2
 unostentatious 5
 """
 
-fallback_cache = {}
 _fallback_subsyl = ["cial", "tia", "cius", "cious", "gui", "ion", "iou",
 		"sia$", ".ely$"]
 _fallback_addsyl = ["ia", "riet", "dien", "iu", "io", "ii",
@@ -94,13 +100,15 @@ fallback_addsyl = [re.compile(a) for a in _fallback_addsyl]
 def _normalize_word(word):
 	return word.strip().lower()
 
-# Read syllable overrides and populate cache with them
+# Read syllable overrides and pin them in the cache; other words are memoized
+# by the shared Syllabifier of the language, see getsyllabifier().
+fallback_cache = syllabifier.SyllableCache(maxsize=0)
 for line in specialsyllables_en.splitlines():
 	line = line.strip()
 	if line:
 		toks = line.split()
 		assert len(toks) == 2
-		fallback_cache[_normalize_word(toks[0])] = int(toks[1])
+		fallback_cache.pin(_normalize_word(toks[0]), int(toks[1]))
 
 
 def countsyllables_en(word):
@@ -115,9 +123,11 @@ def countsyllables_en(word):
 	if word[-1] == "e":
 		word = word[:-1]
 
-	# Check for a cached syllable count
-	if word in fallback_cache:
-		return fallback_cache[word]
+	# Check for a syllable count override; pinned entries are only added at
+	# import time, so they can be read without taking the lock
+	cached = fallback_cache.pinned.get(word)
+	if cached is not None:
+		return cached
 
 	# Count vowel groups
 	result = 0
@@ -136,9 +146,6 @@ def countsyllables_en(word):
 		if r.search(word):
 			result -= 1
 
-	# Cache the syllable count
-	fallback_cache[word] = result
-
 	return result
 
 
@@ -161,10 +168,8 @@ def countsyllables_nlde(word):
 
 # Using Pyphen hyphenation to count french syllables. (https://pyphen.org/)
 def count_syllables_fr(word):
-	import pyphen
-	dic = pyphen.Pyphen(lang='fr')
-	# Count the syllables as the number of hyphenated parts (minimum 1):
-	return max(1, len(dic.inserted(word).split('-')))
+	"""Count syllables of a French word with the shared Pyphen dictionary."""
+	return syllabifier.get('pyphen', 'fr')(word)
 
 
 conjuction_en = r'and|but|or|yet|nor'
@@ -192,41 +197,47 @@ pronoun_en = (
 		'|herself|itself|ourselves|yourselves|themselves'
 		'|oneself|my|mine|his|hers|yours|ours|theirs|its'
 		'|our|that|their|these|this|those|your')
-words_en = collections.OrderedDict([
-	('tobeverb', re.compile(
-		r'\b(be|being|was|were|been|are|is)\b', re.IGNORECASE)),
-	('auxverb', re.compile(
-		r"\b(will|shall|cannot|may|need to|would|should"
-		r"|could|might|must|ought|ought to|can't|can)\b", re.IGNORECASE)),
-	('conjunction', re.compile(
-		'\\b(%s)\\b' % conjuction_en, re.IGNORECASE)),
-	('pronoun', re.compile(
-		'\\b(%s)\\b' % pronoun_en, re.IGNORECASE)),
-	('preposition', re.compile(
-		'\\b(%s)\\b' % preposition_en, re.IGNORECASE)),
-	# a bit limited, but this is exactly what the original style(1) did:
-	('nominalization', re.compile(
-		r'\b\w{3,}(tion|ment|ence|ance)\b', re.IGNORECASE | re.UNICODE)),
-	])
 
-beginnings_en = collections.OrderedDict([
-	('pronoun', re.compile(
-		'(^|\\n)(%s)\\b' % pronoun_en, re.IGNORECASE)),
-	('interrogative', re.compile(
-		r'(^|\n)(why|who|what|whom|when|where|how)\b', re.IGNORECASE)),
-	('article', re.compile(
-		r'(^|\n)(the|a|an)\b', re.IGNORECASE)),
-	('subordination', re.compile(
-		r"(^|\n)(after|because|lest|till|'til|although"
-		r"|before|now that|unless|as|even if|provided that|provided"
-		r"|until|as if|even though|since|as long as|so that"
-		r"|whenever|as much as|if|than|as soon as|inasmuch"
-		r"|in order that|though|while)\b", re.IGNORECASE)),
-	('conjunction', re.compile(
-		'(^|\\n)(%s)\\b' % conjuction_en, re.IGNORECASE)),
-	('preposition', re.compile(
-		'(^|\\n)(%s)\\b' % preposition_en, re.IGNORECASE)),
-	])
+
+def _words_en():
+	return collections.OrderedDict([
+		('tobeverb', re.compile(
+			r'\b(be|being|was|were|been|are|is)\b', re.IGNORECASE)),
+		('auxverb', re.compile(
+			r"\b(will|shall|cannot|may|need to|would|should"
+			r"|could|might|must|ought|ought to|can't|can)\b", re.IGNORECASE)),
+		('conjunction', re.compile(
+			'\\b(%s)\\b' % conjuction_en, re.IGNORECASE)),
+		('pronoun', re.compile(
+			'\\b(%s)\\b' % pronoun_en, re.IGNORECASE)),
+		('preposition', re.compile(
+			'\\b(%s)\\b' % preposition_en, re.IGNORECASE)),
+		# a bit limited, but this is exactly what the original style(1) did:
+		('nominalization', re.compile(
+			r'\b\w{3,}(tion|ment|ence|ance)\b', re.IGNORECASE | re.UNICODE)),
+		])
+
+
+def _beginnings_en():
+	return collections.OrderedDict([
+		('pronoun', re.compile(
+			'(^|\\n)(%s)\\b' % pronoun_en, re.IGNORECASE)),
+		('interrogative', re.compile(
+			r'(^|\n)(why|who|what|whom|when|where|how)\b', re.IGNORECASE)),
+		('article', re.compile(
+			r'(^|\n)(the|a|an)\b', re.IGNORECASE)),
+		('subordination', re.compile(
+			r"(^|\n)(after|because|lest|till|'til|although"
+			r"|before|now that|unless|as|even if|provided that|provided"
+			r"|until|as if|even though|since|as long as|so that"
+			r"|whenever|as much as|if|than|as soon as|inasmuch"
+			r"|in order that|though|while)\b", re.IGNORECASE)),
+		('conjunction', re.compile(
+			'(^|\\n)(%s)\\b' % conjuction_en, re.IGNORECASE)),
+		('preposition', re.compile(
+			'(^|\\n)(%s)\\b' % preposition_en, re.IGNORECASE)),
+		])
+
 
 conjuction_nl = 'en|maar|of|want|dus|noch'
 preposition_nl = (
@@ -254,59 +265,66 @@ pronoun_nl = (
 		"|mijnen|deinen|zijnen|haren|onzen|uwen|hunnen|haren"
 		"|mijner|deiner|zijner|harer|onzer|uwer|hunner|harer"
 		"|mijnes|deines|zijnes|hares|onzes|uwes|hunnes|hares")
-words_nl = collections.OrderedDict([
-	('tobeverb', re.compile(
-		r'\b(ben|bent|is|zijn|was|waren)\b', re.IGNORECASE)),
-	('auxverb', re.compile(
-		"\\b("
-		# NB: past perfect forms of these verbs
-		# ('gehad', 'geweest', 'geworden') are not auxiliary.
-		# with past perfect verb
-		"heb|hebt|heeft|hebben|had|hadden"
-		"|word|wordt|worden|werd|werden"
-		# "|ben|bent|is|zijn|was|waren"
-		# with infinitive
-		"|zal|zult|zullen|zou|zouden"
-		"|kan|kan|kunt|kunnen|kon|konden"
-		"|wil|wilt|willen|wilde|wilden|wou|wouden"
-		"|moet|moeten|moest|moesten"
-		# "|mag|mogen|mocht|mochten"
-		# "|hoef|hoeft|hoeven|hoefde|hoefden"
-		# "|doe|doet|doen|deed|deden"
-		")\\b", re.IGNORECASE)),
-	('conjunction', re.compile(
-		'\\b(%s)\\b' % conjuction_nl, re.IGNORECASE)),
-	('pronoun', re.compile(
-		'\\b(%s)\\b' % pronoun_nl, re.IGNORECASE)),
-	('preposition', re.compile(
-		'\\b(%s)\\b' % preposition_nl, re.IGNORECASE)),
-	# a bit limited, but this is exactly what the original style(1) did:
-	('nominalization', re.compile(
-		r'\b.{3,}(tie|heid|ing|end|ende)\b', re.IGNORECASE)),
-	])
-beginnings_nl = collections.OrderedDict([
-	('pronoun', re.compile(
-		'(^|\\n)(%s)\\b' % pronoun_nl, re.IGNORECASE)),
-	('interrogative', re.compile(
-		r'(^|\n)(wie|wat|waar|waarom|wanneer|hoe|welk|welke)\b',
-		re.IGNORECASE)),
-	('article', re.compile(
-		r"(^|\n)(de|het|een|'t)\b", re.IGNORECASE)),
-	('subordination', re.compile(
-		"(^|\\n)("
-		# onderschikkende voegwoorden
-		"aangezien|als|alsof|behalve|daar|daarom|dat"
-		"|derhalve|doch|doordat|hoewel|indien|mits|nadat"
-		"|noch|ofschoon|omdat|ondanks|opdat|sedert|sinds"
-		"|tenzij|terwijl|toen|totdat|voordat|wanneer"
-		"|zoals|zodat|zodra|zonder dat"
-		# infitief constructies
-		"|om te)\\b", re.IGNORECASE)),
-	('conjunction', re.compile(
-		'(^|\\n)(%s)\\b' % conjuction_nl, re.IGNORECASE)),
-	('preposition', re.compile(
-		'(^|\\n)(%s)\\b' % preposition_nl, re.IGNORECASE)),
-	])
+
+
+def _words_nl():
+	return collections.OrderedDict([
+		('tobeverb', re.compile(
+			r'\b(ben|bent|is|zijn|was|waren)\b', re.IGNORECASE)),
+		('auxverb', re.compile(
+			"\\b("
+			# NB: past perfect forms of these verbs
+			# ('gehad', 'geweest', 'geworden') are not auxiliary.
+			# with past perfect verb
+			"heb|hebt|heeft|hebben|had|hadden"
+			"|word|wordt|worden|werd|werden"
+			# "|ben|bent|is|zijn|was|waren"
+			# with infinitive
+			"|zal|zult|zullen|zou|zouden"
+			"|kan|kan|kunt|kunnen|kon|konden"
+			"|wil|wilt|willen|wilde|wilden|wou|wouden"
+			"|moet|moeten|moest|moesten"
+			# "|mag|mogen|mocht|mochten"
+			# "|hoef|hoeft|hoeven|hoefde|hoefden"
+			# "|doe|doet|doen|deed|deden"
+			")\\b", re.IGNORECASE)),
+		('conjunction', re.compile(
+			'\\b(%s)\\b' % conjuction_nl, re.IGNORECASE)),
+		('pronoun', re.compile(
+			'\\b(%s)\\b' % pronoun_nl, re.IGNORECASE)),
+		('preposition', re.compile(
+			'\\b(%s)\\b' % preposition_nl, re.IGNORECASE)),
+		# a bit limited, but this is exactly what the original style(1) did:
+		('nominalization', re.compile(
+			r'\b.{3,}(tie|heid|ing|end|ende)\b', re.IGNORECASE)),
+		])
+
+
+def _beginnings_nl():
+	return collections.OrderedDict([
+		('pronoun', re.compile(
+			'(^|\\n)(%s)\\b' % pronoun_nl, re.IGNORECASE)),
+		('interrogative', re.compile(
+			r'(^|\n)(wie|wat|waar|waarom|wanneer|hoe|welk|welke)\b',
+			re.IGNORECASE)),
+		('article', re.compile(
+			r"(^|\n)(de|het|een|'t)\b", re.IGNORECASE)),
+		('subordination', re.compile(
+			"(^|\\n)("
+			# onderschikkende voegwoorden
+			"aangezien|als|alsof|behalve|daar|daarom|dat"
+			"|derhalve|doch|doordat|hoewel|indien|mits|nadat"
+			"|noch|ofschoon|omdat|ondanks|opdat|sedert|sinds"
+			"|tenzij|terwijl|toen|totdat|voordat|wanneer"
+			"|zoals|zodat|zodra|zonder dat"
+			# infitief constructies
+			"|om te)\\b", re.IGNORECASE)),
+		('conjunction', re.compile(
+			'(^|\\n)(%s)\\b' % conjuction_nl, re.IGNORECASE)),
+		('preposition', re.compile(
+			'(^|\\n)(%s)\\b' % preposition_nl, re.IGNORECASE)),
+		])
+
 
 conjuction_de = ('und|oder|aber|sondern|doch|nur|bloß|denn'
 		'weder|noch|sowie')
@@ -326,58 +344,65 @@ pronoun_de = (
 	'|meinem|deinem|seinem|unserem|eurem|ihrem'  # Genitiv
 	'|meinen|deinen|seinen|unseren|euren|ihren'  # Genitiv
 		)
-words_de = collections.OrderedDict([
-	('tobeverb', re.compile("\\b("
-		"sein|bin|bist|ist|sind|seid|war|warst|wart"
-		"|waren|gewesen|wäre|wärst|wär|wären|wärt|wäret"
-		")\\b", re.IGNORECASE)),
-	('auxverb', re.compile("\\b("
-		"haben|habe|hast|hat|habt|gehabt|hätte|hättest"
-		"|hätten|hättet"
-		"|werden|werde|wirst|wird|werdet|geworden|würde"
-		"|würdest|würden|würdet"
-		"|können|kann|kannst|könnt|konnte|konntest|konnten"
-		"|konntet|gekonnt|könnte|könntest|könnten|könntet"
-		"|müssen|muss|muß|musst|müsst|musste|musstest|mussten"
-		"|gemusst|müsste|müsstest|müssten|müsstet"
-		"|sollen|soll|sollst|sollt|sollte|solltest|solltet"
-		"|sollten|gesollt"
-		")\\b", re.IGNORECASE)),
-	('conjunction', re.compile(
-		'\\b(%s)\\b' % conjuction_de, re.IGNORECASE)),
-	('pronoun', re.compile(
-		'\\b(%s)\\b' % pronoun_de, re.IGNORECASE)),
-	('preposition', re.compile(
-		'\\b(%s)\\b' % preposition_de, re.IGNORECASE)),
-	('nominalization', re.compile(
-		r'\b.{3,}(ung|heit|keit|nis|tum)\b', re.IGNORECASE)),
-	])
-beginnings_de = collections.OrderedDict([
-	('pronoun', re.compile(
-		'(^|\\n)(%s)\\b' % pronoun_de, re.IGNORECASE)),
-	('interrogative', re.compile(
-		r'(^|\n)(wer|was|wem|wen|wessen|wo|wie|warum|weshalb|wann'
-		r'|wieso|weswegen)\b', re.IGNORECASE)),
-	('article', re.compile(
-		r"(^|\n)(der|die|das|des|dem|den|ein|eine|einer|eines|einem|einen)\b",
-		re.IGNORECASE)),
-	('subordination', re.compile("(^|\\n)("
-		# bei Nebensätzen
-		"als|als dass|als daß|als ob|anstatt dass|anstatt daß"
-		"|ausser dass|ausser daß|ausser wenn|bevor|bis|da|damit"
-		"|dass|daß|ehe|falls|indem|je|nachdem|ob|obgleich"
-		"|obschon|obwohl|ohne dass|ohne daß|seit|so daß|sodass"
-		"|sobald|sofern|solange|so oft|statt dass|statt daß"
-		"|während|weil|wenn|wenn auch|wenngleich|wie|wie wenn"
-		"|wiewohl|wobei|wohingegen|zumal"
-		# bei Infinitivgruppen
-		"|als zu|anstatt zu|ausser zu|ohne zu|statt zu|um zu"
-		")\\b", re.IGNORECASE)),
-	('conjunction', re.compile(
-		'(^|\\n)(%s)\\b' % conjuction_de, re.IGNORECASE)),
-	('preposition', re.compile(
-		'(^|\\n)(%s)\\b' % preposition_de, re.IGNORECASE)),
-	])
+
+
+def _words_de():
+	return collections.OrderedDict([
+		('tobeverb', re.compile("\\b("
+			"sein|bin|bist|ist|sind|seid|war|warst|wart"
+			"|waren|gewesen|wäre|wärst|wär|wären|wärt|wäret"
+			")\\b", re.IGNORECASE)),
+		('auxverb', re.compile("\\b("
+			"haben|habe|hast|hat|habt|gehabt|hätte|hättest"
+			"|hätten|hättet"
+			"|werden|werde|wirst|wird|werdet|geworden|würde"
+			"|würdest|würden|würdet"
+			"|können|kann|kannst|könnt|konnte|konntest|konnten"
+			"|konntet|gekonnt|könnte|könntest|könnten|könntet"
+			"|müssen|muss|muß|musst|müsst|musste|musstest|mussten"
+			"|gemusst|müsste|müsstest|müssten|müsstet"
+			"|sollen|soll|sollst|sollt|sollte|solltest|solltet"
+			"|sollten|gesollt"
+			")\\b", re.IGNORECASE)),
+		('conjunction', re.compile(
+			'\\b(%s)\\b' % conjuction_de, re.IGNORECASE)),
+		('pronoun', re.compile(
+			'\\b(%s)\\b' % pronoun_de, re.IGNORECASE)),
+		('preposition', re.compile(
+			'\\b(%s)\\b' % preposition_de, re.IGNORECASE)),
+		('nominalization', re.compile(
+			r'\b.{3,}(ung|heit|keit|nis|tum)\b', re.IGNORECASE)),
+		])
+
+
+def _beginnings_de():
+	return collections.OrderedDict([
+		('pronoun', re.compile(
+			'(^|\\n)(%s)\\b' % pronoun_de, re.IGNORECASE)),
+		('interrogative', re.compile(
+			r'(^|\n)(wer|was|wem|wen|wessen|wo|wie|warum|weshalb|wann'
+			r'|wieso|weswegen)\b', re.IGNORECASE)),
+		('article', re.compile(
+			r"(^|\n)(der|die|das|des|dem|den|ein|eine|einer|eines|einem|einen)\b",
+			re.IGNORECASE)),
+		('subordination', re.compile("(^|\\n)("
+			# bei Nebensätzen
+			"als|als dass|als daß|als ob|anstatt dass|anstatt daß"
+			"|ausser dass|ausser daß|ausser wenn|bevor|bis|da|damit"
+			"|dass|daß|ehe|falls|indem|je|nachdem|ob|obgleich"
+			"|obschon|obwohl|ohne dass|ohne daß|seit|so daß|sodass"
+			"|sobald|sofern|solange|so oft|statt dass|statt daß"
+			"|während|weil|wenn|wenn auch|wenngleich|wie|wie wenn"
+			"|wiewohl|wobei|wohingegen|zumal"
+			# bei Infinitivgruppen
+			"|als zu|anstatt zu|ausser zu|ohne zu|statt zu|um zu"
+			")\\b", re.IGNORECASE)),
+		('conjunction', re.compile(
+			'(^|\\n)(%s)\\b' % conjuction_de, re.IGNORECASE)),
+		('preposition', re.compile(
+			'(^|\\n)(%s)\\b' % preposition_de, re.IGNORECASE)),
+		])
+
 
 ################################################################################
 # French coordinating conjunctions
@@ -462,32 +487,38 @@ article_fr = (
     "le|la|les|l'|un|une|des|du|au|aux"
 )
 
-words_fr = collections.OrderedDict([
-	('tobeverb', re.compile(
-		'\\b(%s)\\b' % tobe_verb_fr, re.IGNORECASE)),
-	('auxverb', re.compile(
-		'\\b(%s)\\b' % auxverb_fr, re.IGNORECASE)),
-	('conjunction', re.compile(
-		'\\b(%s)\\b' % conjunction_fr, re.IGNORECASE)),
-	('preposition', re.compile(
-		'\\b(%s)\\b' % preposition_fr, re.IGNORECASE)),
-	('nominalization', re.compile(
-		r'\b\w{2,}(tion|sion|ment|ence|ance|age|ure|ité|té|eur|euse|isme)\b', re.IGNORECASE | re.UNICODE)),
-	('subordination', re.compile(
-		'\\b(%s)\\b' % subordination_fr, re.IGNORECASE)),
-	('article', re.compile(
-		'\\b(%s)\\b' % article_fr, re.IGNORECASE)),
-])
-
-beginnings_fr = collections.OrderedDict([
-	('pronoun', re.compile(
-		'(^|\\n)(%s)\\b' % pronoun_fr, re.IGNORECASE)),
-	('interrogative', re.compile(
-		r'(^|\n)(pourquoi|qui|que|quoi|quand|où|comment)\b', re.IGNORECASE)),
-])
+
+def _words_fr():
+	return collections.OrderedDict([
+		('tobeverb', re.compile(
+			'\\b(%s)\\b' % tobe_verb_fr, re.IGNORECASE)),
+		('auxverb', re.compile(
+			'\\b(%s)\\b' % auxverb_fr, re.IGNORECASE)),
+		('conjunction', re.compile(
+			'\\b(%s)\\b' % conjunction_fr, re.IGNORECASE)),
+		('preposition', re.compile(
+			'\\b(%s)\\b' % preposition_fr, re.IGNORECASE)),
+		('nominalization', re.compile(
+			r'\b\w{2,}(tion|sion|ment|ence|ance|age|ure|ité|té|eur|euse|isme)\b', re.IGNORECASE | re.UNICODE)),
+		('subordination', re.compile(
+			'\\b(%s)\\b' % subordination_fr, re.IGNORECASE)),
+		('article', re.compile(
+			'\\b(%s)\\b' % article_fr, re.IGNORECASE)),
+		])
+
+
+def _beginnings_fr():
+	return collections.OrderedDict([
+		('pronoun', re.compile(
+			'(^|\\n)(%s)\\b' % pronoun_fr, re.IGNORECASE)),
+		('interrogative', re.compile(
+			r'(^|\n)(pourquoi|qui|que|quoi|quand|où|comment)\b', re.IGNORECASE)),
+		])
+
+
 ################################################################################
 # Long Dale-Chall word list of 3000 words recognized by 80 % of fifth graders
-basicwords_en = frozenset("""
+_basicwords_en = """
 n't 'm 'll 'd 's 're 've
 t m ll d s re ve don shouldn aren didn hadn hasn haven isn needn shan wasn
 a able aboard about above absent accept accident account
@@ -733,10 +764,10 @@ worst worth would wouldn't wound wove wrap wrapped wreck wren wring write
 writing written wrong wrote wrung yard yarn year yell yellow yes yesterday yet
 yolk yonder you you'd you'll young youngster your yours you're yourself
 yourselves youth you've
-""".lower().split())
+"""
 
 # 3000 most frequent word tokens in Sonar 500 corpus
-basicwords_nl = frozenset("""
+_basicwords_nl = """
 . de , van het een en in dat is op te zijn voor met ik die niet ) ( : " maar er
 ' aan - ook je als om ? hij ze bij dan nog was naar uit of door we heeft over
 wat al tot worden meer hebben wordt geen wel jaar kan ! dit nu zich zo hun deze
@@ -1020,10 +1051,10 @@ scherp gewonden wetten voorts automatisch massaal vrezen bord stroom houten
 jongere zanger inclusief alcohol uitgesproken ruime cm geconfronteerd stelling
 fusie geslacht verlopen pakistan plant zuid-afrika vooruitgang verhogen knie
 aparte gepleegd
-""".split())
+"""
 
 # 1000 MFW German; http://www.wortschatz.uni-leipzig.de/Papers/top1000de.txt
-basicwords_de = frozenset("""
+_basicwords_de = """
 der die und in den von zu das mit sich des auf für ist im dem nicht ein Die
 eine als auch es an werden aus er hat daß sie nach wird bei einer Der um am
 sind noch wie einem über einen Das so Sie zum war haben nur oder aber vor zur
@@ -1115,10 +1146,10 @@ häufig Chancen Vor allem Position alt Luft Studenten übernehmen stärker ohneh
 zeigte geplanten Reihe darum verhindern begann Medien verkauft Minister wichtig
 amerikanische sah gesamten einst verwendet vorbei Behörden helfen Folgen
 bezeichnet
-""".lower().split())
+"""
 
 # 3558 MFW French; CATACH, N. (1985). Les listes orthographiques de base du français. Nathan, Paris
-basicwords_fr = frozenset("""
+_basicwords_fr = """
 A À ABANDONNER ABBÉ ABORD ABSENCE ABSOLU ABSOLUMENT ACCENT ACCEPTER ACCIDENT ACCIDENTS 
 ACCOMPAGNAIENT ACCOMPAGNAIT ACCOMPAGNER ACCOMPLIR ACCOMPLIT ACCORD ACCORDER ACCORDS 
 ACHETER ACHEVER ACTE ACTES ACTION ACTIONS ACTIVITÉ ACTIVITÉS ACTUEL ACTUELLE ACTUELLEMENT 
@@ -1403,28 +1434,104 @@ VOIES VOILÀ VOILE VOIR VOIS VOISIN VOISINS VOIT VOITURE VOITURES VOIX VOLONTÉ
 VOS VOTRE VOUDRAIS VOUDRAIT VOUDRAS VOUDREZ VOULAIENT VOULAIS VOULAIT VOULANT VOULEZ VOULOIR VOULONS VOULU 
 VOULUT VOUS -VOUS VOUS ET MOI VOYAGE VOYAGES VOYAIENT VOYAIS VOYAIT VOYANT VOYEZ VOYONS VRAI VRAIE VRAIES 
 VRAIMENT VRAIS VU VUE VUES VUS Y -Y YEUX
-""".lower().split())
+"""
 ################################################################################
-LANGDATA = dict(
-	en=dict(
+class LazyLangData(MutableMapping):
+	"""A mapping of language codes to language data that is compiled when a
+	language is first used.
+
+	A value may be given as a dictionary, or as a function without arguments
+	that returns one; the function is called on first access, after which its
+	result is kept."""
+
+	def __init__(self, items=()):
+		self._loaders = collections.OrderedDict(items)
+		self._data = {}
+		self._lock = threading.Lock()
+
+	def __getitem__(self, lang):
+		try:
+			return self._data[lang]
+		except KeyError:
+			pass
+		with self._lock:
+			if lang not in self._data:
+				value = self._loaders[lang]
+				self._data[lang] = value() if callable(value) else value
+			return self._data[lang]
+
+	def __setitem__(self, lang, value):
+		with self._lock:
+			self._loaders[lang] = value
+			self._data.pop(lang, None)
+
+	def __delitem__(self, lang):
+		with self._lock:
+			del self._loaders[lang]
+			self._data.pop(lang, None)
+
+	def __iter__(self):
+		return iter(self._loaders)
+
+	def __len__(self):
+		return len(self._loaders)
+
+	def loaded(self):
+		"""Return the codes of the languages that have been compiled."""
+		return [lang for lang in self._loaders if lang in self._data]
+
+
+LANGDATA = LazyLangData([
+	('en', lambda: dict(
 		syllables=countsyllables_en,
-		words=words_en,
-		beginnings=beginnings_en,
-		basicwords=basicwords_en),
-	nl=dict(
+		words=_words_en(),
+		beginnings=_beginnings_en(),
+		basicwords=frozenset(_basicwords_en.lower().split()))),
+	('nl', lambda: dict(
 		syllables=countsyllables_nlde,
-		words=words_nl,
-		beginnings=beginnings_nl,
-		basicwords=basicwords_nl),
-	de=dict(
+		words=_words_nl(),
+		beginnings=_beginnings_nl(),
+		basicwords=frozenset(_basicwords_nl.split()))),
+	('de', lambda: dict(
 		syllables=countsyllables_nlde,
-		words=words_de,
-		beginnings=beginnings_de,
-		basicwords=basicwords_de),
+		words=_words_de(),
+		beginnings=_beginnings_de(),
+		basicwords=frozenset(_basicwords_de.lower().split()))),
 	# Settings for when the input language is French:
-	fr=dict(
-		syllables=count_syllables_fr,
-		words=words_fr,
-		beginnings=beginnings_fr,
-		basicwords=basicwords_fr),
-)
\ No newline at end of file
+	('fr', lambda: dict(
+		syllables='pyphen',
+		words=_words_fr(),
+		beginnings=_beginnings_fr(),
+		basicwords=frozenset(_basicwords_fr.lower().split()))),
+	])
+
+
+def __getattr__(name):
+	"""Provide the compiled language data under the module-level names it
+	used to have, e.g., ``words_en`` and ``basicwords_nl``."""
+	kind, _, lang = name.rpartition('_')
+	if kind in ('words', 'beginnings', 'basicwords') and lang in LANGDATA:
+		return LANGDATA[lang][kind]
+	raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+def getsyllabifier(lang):
+	"""Return the shared syllable counter for a language.
+
+	The ``syllables`` entry of a language is either a function or the name of
+	an engine registered with ``readability.syllabifier.register()``."""
+	return syllabifier.get(LANGDATA[lang]['syllables'], lang)
+
+
+_scanners = {}
+
+
+def getscanner(lang):
+	"""Return the shared single-pass ``Scanner`` for the word usage and
+	sentence beginning categories of a language."""
+	data = LANGDATA[lang]
+	scanner, key = _scanners.get(lang, (None, None))
+	if key is not data:  # not yet compiled, or LANGDATA entry was replaced
+		scanner = Scanner(data['words'], data['beginnings'])
+		_scanners[lang] = scanner, data
+	return scanner
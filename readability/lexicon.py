@@ -0,0 +1,211 @@
+"""A compact binary lexicon of syllable counts.
+
+A lexicon is built once from a word list, such as the CMU Pronouncing
+Dictionary, and stored as a file with the words in sorted order::
+
+	$ python -m readability.lexicon cmudict.dict en.lex
+
+At runtime, the file is memory-mapped, so that it is loaded lazily and shared
+by all processes that use it; a word is looked up with a binary search. With
+``uselexicon()``, or the ``--lexicon`` option of the command line interface,
+the syllables of words in the lexicon are taken from it; other words are
+counted with the existing syllable counter of the language.
+
+File format (integers are unsigned little-endian)::
+
+	magic     8 bytes, 'RDLEX1\\0\\0'
+	n         4 bytes, number of words
+	offsets   4 * (n + 1) bytes, start of each word in ``words``
+	counts    n bytes, number of syllables of each word
+	words     the UTF-8 encoded words, lowercase, sorted bytewise"""
+
+from __future__ import print_function, unicode_literals
+import io
+import os
+import sys
+import mmap
+import array
+import hashlib
+import struct
+
+MAGIC = b'RDLEX1\0\0'
+HEADER = struct.Struct('<8sI')
+
+
+class Lexicon(object):
+	"""A memory-mapped mapping of lowercase words to syllable counts.
+
+	>>> import os, tempfile
+	>>> filename = os.path.join(tempfile.mkdtemp(), 'test.lex')
+	>>> build([('syllable', 3), ('word', 1), ('Area', 3)], filename)
+	>>> lexicon = Lexicon(filename)
+	>>> len(lexicon), lexicon.get('area'), lexicon.get('Word')
+	(3, 3, 1)
+	>>> 'wort' in lexicon
+	False
+
+	:param filename: a file written by ``build()``."""
+
+	def __init__(self, filename):
+		self.filename = filename
+		with io.open(filename, 'rb') as inp:
+			self.data = mmap.mmap(inp.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, self.size = HEADER.unpack_from(self.data, 0)
+		if magic != MAGIC:
+			raise ValueError('not a syllable lexicon: %r' % filename)
+		start = HEADER.size
+		end = start + 4 * (self.size + 1)
+		if sys.byteorder == 'little':
+			self.offsets = memoryview(self.data)[start:end].cast('I')
+		else:
+			self.offsets = array.array('I', self.data[start:end])
+			self.offsets.byteswap()
+		self.counts = memoryview(self.data)[end:end + self.size]
+		self.wordstart = end + self.size
+		self._digest = None
+
+	@property
+	def digest(self):
+		"""A hash of the contents of the lexicon file; computed once."""
+		if self._digest is None:
+			self._digest = hashlib.sha256(self.data).hexdigest()
+		return self._digest
+
+	def get(self, word, default=None):
+		"""Return the number of syllables of ``word``, or ``default`` if it
+		is not in the lexicon; the word is lowercased."""
+		key = word.lower().encode('utf8')
+		data, offsets, base = self.data, self.offsets, self.wordstart
+		lo, hi = 0, self.size
+		while lo < hi:
+			mid = (lo + hi) // 2
+			other = data[base + offsets[mid]:base + offsets[mid + 1]]
+			if other < key:
+				lo = mid + 1
+			elif other > key:
+				hi = mid
+			else:
+				return self.counts[mid]
+		return default
+
+	def __contains__(self, word):
+		return self.get(word) is not None
+
+	def __len__(self):
+		return self.size
+
+	def close(self):
+		"""Release the memory map."""
+		if isinstance(self.offsets, memoryview):
+			self.offsets.release()
+		self.counts.release()
+		self.data.close()
+
+
+def build(entries, filename):
+	"""Write a lexicon file.
+
+	:param entries: an iterable of ``(word, syllables)`` tuples; words are
+		lowercased, and the first count of a word is used.
+	:param filename: the file to write."""
+	lexicon = {}
+	for word, count in entries:
+		key = word.lower().encode('utf8')
+		if key and key not in lexicon:
+			if not 0 <= count < 256:
+				raise ValueError('syllable count out of range: %r %r' % (
+						word, count))
+			lexicon[key] = count
+	words = sorted(lexicon)
+	offsets = array.array('I', [0])
+	for word in words:
+		offsets.append(offsets[-1] + len(word))
+	if sys.byteorder != 'little':
+		offsets.byteswap()
+	with io.open(filename, 'wb') as out:
+		out.write(HEADER.pack(MAGIC, len(words)))
+		out.write(offsets.tobytes())
+		out.write(bytes(bytearray(lexicon[word] for word in words)))
+		out.write(b''.join(words))
+
+
+def readwordlist(filename, encoding='utf8'):
+	"""Read a word list with syllable counts.
+
+	Each line holds a word and either its number of syllables, or its
+	pronunciation in the ARPAbet notation of the CMU Pronouncing Dictionary,
+	in which case the number of vowels (phonemes with a stress digit) is
+	used. Alternative pronunciations such as ``word(2)`` and comments
+	(starting with ``;;;`` or ``#``) are skipped.
+
+	:yields: tuples ``(word, syllables)``."""
+	with io.open(filename, encoding=encoding, errors='replace') as inp:
+		for line in inp:
+			if line.startswith((';;;', '#')):
+				continue
+			fields = line.split('#')[0].split()
+			if len(fields) < 2 or fields[0].endswith(')'):
+				continue
+			elif len(fields) == 2 and fields[1].isdigit():
+				yield fields[0], int(fields[1])
+			else:
+				yield fields[0], sum(phone[-1].isdigit()
+						for phone in fields[1:])
+
+
+def uselexicon(filename, lang='en'):
+	"""Take syllable counts of a language from a lexicon file, and count
+	words that are not in it with the current counter of the language."""
+	from readability.langdata import LANGDATA, getsyllabifier
+	lexicon = Lexicon(filename)
+	# when replacing another lexicon, fall back to its fallback
+	fallback = getattr(LANGDATA[lang]['syllables'], 'fallback', None
+			) or getsyllabifier(lang)
+
+	def countsyllables(word):
+		result = lexicon.get(word)
+		return fallback(word) if result is None else result
+
+	countsyllables.lexicon = lexicon
+	countsyllables.fallback = fallback
+	LANGDATA[lang]['syllables'] = countsyllables
+	return lexicon
+
+
+def getlexicons():
+	"""Return a dictionary with the absolute filename of the lexicon used
+	for each language, if any; for ``uselexicons()`` in another process."""
+	from readability.langdata import LANGDATA
+	result = {}
+	for lang in LANGDATA.loaded():  # uselexicon() loads the language
+		lexicon = getattr(LANGDATA[lang].get('syllables'), 'lexicon', None)
+		if lexicon is not None:
+			result[lang] = os.path.abspath(lexicon.filename)
+	return result
+
+
+def uselexicons(lexicons):
+	"""Use the lexicons returned by ``getlexicons()``, unless they are in
+	use already, as in a process that was forked after they were loaded."""
+	from readability.langdata import LANGDATA
+	for lang, filename in lexicons.items():
+		lexicon = getattr(LANGDATA[lang].get('syllables'), 'lexicon', None)
+		if (lexicon is None
+				or os.path.abspath(lexicon.filename) != filename):
+			uselexicon(filename, lang)
+
+
+def main():
+	"""Build a lexicon from the command line."""
+	if len(sys.argv) != 3:
+		print('usage: python -m readability.lexicon WORDLIST OUTPUT\n'
+				'Build a syllable lexicon from a word list; see the module '
+				'documentation.', file=sys.stderr)
+		sys.exit(2)
+	build(readwordlist(sys.argv[1]), sys.argv[2])
+
+
+__all__ = ['Lexicon', 'build', 'readwordlist', 'uselexicon']
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,198 @@
+"""Write the measures of a number of files as they are scored.
+
+Each row is written as soon as its file has been scored, in the order of the
+filenames, so memory use does not grow with the number of files, and the
+rows of files that were scored are kept if a run is interrupted. The
+columns are those of ``getcolumns()``, followed by an ``error`` column when
+files are scored in parallel. pandas is not needed.
+
+For large numbers of files, the columnar formats ``arrow`` (the Arrow IPC
+file format) and ``parquet`` are smaller and much faster to write and read
+than CSV; rows are collected into record batches with a column of 64-bit
+floats or integers for each measure. These formats require pyarrow.
+
+>>> import io
+>>> out = io.StringIO()
+>>> writer = CSVWriter(out, ['words', 'sentences'])
+>>> writer.write('a.txt', {'words': 5, 'sentences': 2})
+>>> print(out.getvalue().strip())
+,words,sentences
+a.txt,5,2
+"""
+
+from __future__ import unicode_literals
+import csv
+import json
+import collections
+from readability import getcolumns, _scorefiles
+
+BATCHSIZE = 65536  # rows in a record batch of the columnar formats
+
+
+class CSVWriter(object):
+	"""Write rows in comma separated value format, with the filename in the
+	first column, as ``pandas.DataFrame.to_csv()``.
+
+	:param out: a text file.
+	:param columns: a sequence of column names."""
+
+	def __init__(self, out, columns):
+		self.out = out
+		self.columns = list(columns)
+		self.writer = csv.writer(out, lineterminator='\n')
+		self.writer.writerow([''] + self.columns)
+
+	def write(self, name, result=None, error=None):
+		"""Write the row of a file with either its merged measures, or
+		the description of an error."""
+		if error is not None:
+			result = {'error': error}
+		self.writer.writerow([name] + [result.get(column, '')
+				for column in self.columns])
+		self.out.flush()
+
+	def close(self):
+		"""Flush the output."""
+		self.out.flush()
+
+
+class JSONLWriter(object):
+	"""Write rows as JSON objects, one per line, with the filename under
+	``"filename"``; a file that failed has only an ``"error"``.
+
+	:param out: a text file.
+	:param columns: a sequence of column names."""
+
+	def __init__(self, out, columns):
+		self.out = out
+		self.columns = [column for column in columns if column != 'error']
+
+	def write(self, name, result=None, error=None):
+		"""Write the row of a file; see ``CSVWriter.write()``."""
+		row = collections.OrderedDict([('filename', name)])
+		if error is None:
+			for column in self.columns:
+				row[column] = result[column]
+		else:
+			row['error'] = error
+		self.out.write(json.dumps(row) + '\n')
+		self.out.flush()
+
+	def close(self):
+		"""Flush the output."""
+		self.out.flush()
+
+
+class ArrowWriter(object):
+	"""Write rows in record batches to an Arrow IPC file, with the filename
+	in the first column; columns of a file that failed are null.
+
+	>>> import io, pyarrow
+	>>> from readability import getmeasures
+	>>> out = io.BytesIO()
+	>>> writer = ArrowWriter(out, getcolumns('en', types=True))
+	>>> writer.write('a.txt', getmeasures('A tokenized sentence .', merge=True))
+	>>> writer.close()
+	>>> table = pyarrow.ipc.open_file(out.getvalue()).read_all()
+	>>> table.num_rows, table.schema.field('words').type
+	(1, DataType(int64))
+
+	:param out: a binary file or a filename.
+	:param columns: an ordered dictionary with the name and type of each
+		column, as returned by ``getcolumns(lang, types=True)``; the type is
+		``float``, ``int`` or ``str``.
+	:param batchsize: the number of rows in a record batch."""
+
+	def __init__(self, out, columns, batchsize=BATCHSIZE):
+		import pyarrow
+		types = {float: pyarrow.float64(), int: pyarrow.int64(),
+				str: pyarrow.string()}
+		self.out = out
+		self.columns = list(columns)
+		self.schema = pyarrow.schema([('filename', pyarrow.string())] + [
+				(name, types[columns[name]]) for name in self.columns])
+		self.batchsize = batchsize
+		self.names = []
+		self.values = [[] for _ in self.columns]
+		self.writer = self._newwriter(out, self.schema)
+
+	def _newwriter(self, out, schema):
+		import pyarrow
+		return pyarrow.ipc.new_file(out, schema)
+
+	def write(self, name, result=None, error=None):
+		"""Add the row of a file; see ``CSVWriter.write()``."""
+		if error is not None:
+			result = {'error': error}
+		self.names.append(name)
+		for column, values in zip(self.columns, self.values):
+			values.append(result.get(column))
+		if len(self.names) >= self.batchsize:
+			self.flush()
+
+	def flush(self):
+		"""Write the rows added since the last batch as a record batch."""
+		import pyarrow
+		if self.names:
+			self._writebatch(pyarrow.record_batch(
+					[self.names] + self.values, schema=self.schema))
+			self.names = []
+			self.values = [[] for _ in self.columns]
+
+	def _writebatch(self, batch):
+		self.writer.write_batch(batch)
+
+	def close(self):
+		"""Write the remaining rows and the end of the file."""
+		self.flush()
+		self.writer.close()
+
+
+class ParquetWriter(ArrowWriter):
+	"""Write rows in row groups to a Parquet file; parameters as for
+	``ArrowWriter``."""
+
+	def _newwriter(self, out, schema):
+		import pyarrow.parquet
+		return pyarrow.parquet.ParquetWriter(out, schema)
+
+	def _writebatch(self, batch):
+		self.writer.write_batch(batch, row_group_size=self.batchsize)
+
+
+WRITERS = {'csv': CSVWriter, 'jsonl': JSONLWriter, 'arrow': ArrowWriter,
+		'parquet': ParquetWriter}
+
+
+def writemeasures(filenames, out, format='csv', lang='en', encoding='utf8',
+		tokenizer=None, workers=None, chunksize=1, mmap=False, stats=None,
+		cache=None):  # pylint: disable=redefined-builtin
+	"""Score files and write a row with the measures of each.
+
+	:param out: a text file, or with a format that is not text, a binary
+		file.
+	:param format: one of the keys of ``WRITERS``.
+	:param lang, encoding, tokenizer, workers, chunksize, mmap, stats, cache:
+		as for ``getdataframe()``; with ``workers``, a file that cannot be
+		scored gets a row with a description of the failure in the
+		``error`` column, which is empty for other files.
+	:returns: the number of rows written."""
+	if mmap and tokenizer is not None:
+		raise ValueError('mmap cannot be combined with a tokenizer.')
+	filenames = list(filenames)
+	columns = getcolumns(lang, types=True)
+	if workers is not None:
+		columns['error'] = str
+	writer = WRITERS[format](out, columns)
+	try:
+		for name, (result, error) in zip(filenames, _scorefiles(
+				filenames, lang, encoding, tokenizer, workers, chunksize,
+				mmap, stats, cache)):
+			writer.write(name, result, error)
+	finally:
+		writer.close()
+	return len(filenames)
+
+
+__all__ = ['CSVWriter', 'JSONLWriter', 'ArrowWriter', 'ParquetWriter',
+		'WRITERS', 'writemeasures']
@@ -0,0 +1,232 @@
+"""Count word usage and sentence beginnings in a single pass.
+
+The categories in ``LANGDATA`` are regular expressions that are each run over
+the whole text. Most of them are word lists of the form ``\\b(a|b|c)\\b`` or
+``(^|\\n)(a|b|c)\\b``, or suffix patterns such as ``\\b\\w{3,}(tion|ment)\\b``.
+A ``Scanner`` compiles such patterns into a table indexed by the first word of
+each alternative, and counts every category while traversing the words of the
+text once. A suffix pattern with ``.{3,}`` instead of ``\\w{3,}`` matches at
+most once per line, namely when a word with the suffix ends far enough from
+the first word of the line. Patterns of any other form are counted with their
+regular expression, so the counts are the same as those of ``finditer``. Words
+are compared case-insensitively as by ``re.IGNORECASE``, which matches a few
+characters differently from ``str.lower()``, such as the long s (ſ)."""
+
+from __future__ import unicode_literals
+try:
+	import re2 as re
+except ImportError:
+	import re
+
+FOLDED = 100000  # maximum number of non-ASCII words with their lowercase
+SCANRE = re.compile(r'\w+|\n')
+FIRSTRUNRE = re.compile(r'\w*')
+METACHARS = frozenset('\\.^$*+?{}[]()|')
+WORDLISTRE = re.compile(r'^\\b\((.*)\)\\b$', re.DOTALL)
+BEGINLISTRE = re.compile(r'^\(\^\|\\n\)\((.*)\)\\b$', re.DOTALL)
+SUFFIXRE = re.compile(r'^\\b(\\w|\.)\{(\d+),\}\((.*)\)\\b$', re.DOTALL)
+# characters that re.IGNORECASE matches as another character than the one
+# given by str.lower(), and the lowercase of that character; from the case
+# tables of re. A final sigma is included, since str.lower() lowercases a
+# capital sigma to a final sigma at the end of a word.
+CASEFOLD = str.maketrans(
+		'\xb5\u0130\u0131\u017f\u0345\u03a3\u03c2\u03d0\u03d1\u03d5\u03d6'
+		'\u03f0\u03f1\u03f5\u1c80\u1c81\u1c82\u1c83\u1c84\u1c85\u1c86\u1c87'
+		'\u1c88\u1e9b\u1fbe\u1fd3\u1fe3\ufb06',
+		'\u03bciis\u03b9\u03c3\u03c3\u03b2\u03b8\u03c6\u03c0\u03ba\u03c1'
+		'\u03b5\u0432\u0434\u043e\u0441\u0442\u0442\u044a\u0463\ua64b'
+		'\u1e61\u03b9\u0390\u03b0\ufb05')
+
+
+def _isword(char):
+	"""Return True if ``char`` is matched by ``\\w``."""
+	return char.isalnum() or char == '_'
+
+
+def _lower(text):
+	"""Lowercase ``text`` as compared by ``re.IGNORECASE``; the result has
+	the same length."""
+	if text.isascii():
+		return text.lower()
+	return text.translate(CASEFOLD).lower()
+
+
+def _literals(alts):
+	"""Test whether all alternatives are non-empty literal strings."""
+	return all(alt and not METACHARS.intersection(alt) for alt in alts)
+
+
+def _alternatives(regexp, form):
+	"""Return the alternatives of a word list pattern, or None if the pattern
+	does not have the given form or is not a case-insensitive list of literal
+	strings."""
+	match = form.match(regexp.pattern)
+	if match is None or not regexp.flags & re.IGNORECASE:
+		return None
+	alts = match.groups()[-1].split('|')
+	return alts if _literals(alts) else None
+
+
+def _index(entries, alts, idx):
+	"""Add the alternatives of category ``idx`` to a table keyed by the
+	lowercased first word of each alternative."""
+	for n, alt in enumerate(alts):
+		key = _lower(FIRSTRUNRE.match(alt).group())
+		entries.setdefault(key, []).append((
+				idx, n, _lower(alt), len(alt), _isword(alt[-1]),
+				len(key) == len(alt)))
+	for items in entries.values():
+		items.sort()
+
+
+def _matches(text, start, alt, length, endsword):
+	"""Test whether an alternative matches at ``start`` followed by ``\\b``;
+	the caller ensures ``start`` is a word boundary."""
+	end = start + length
+	if _lower(text[start:end]) != alt:
+		return False
+	if endsword:
+		return end == len(text) or not _isword(text[end])
+	return end < len(text) and _isword(text[end])
+
+
+class Scanner(object):
+	"""Single-pass counter for the word usage and sentence beginning
+	categories of a language.
+
+	>>> from readability.langdata import LANGDATA
+	>>> scanner = Scanner(LANGDATA['en']['words'],
+	...		LANGDATA['en']['beginnings'])
+	>>> wordusage, beginnings = scanner.scan('He was here .\\nWhy ?')
+	>>> wordusage['tobeverb'], beginnings['pronoun']
+	(1, 1)
+	"""
+
+	def __init__(self, words, beginnings):
+		self.wordnames = list(words)
+		self.beginningnames = list(beginnings)
+		self.words = {}
+		self.suffixes = []
+		self.wordregexps = []
+		self.beginnings = {}
+		self.beginningregexps = []
+		self.folded = {}  # lowercase of non-ASCII words seen by scan()
+		for idx, (name, regexp) in enumerate(words.items()):
+			alts = _alternatives(regexp, WORDLISTRE)
+			match = SUFFIXRE.match(regexp.pattern)
+			if alts is not None and all(_isword(alt[0]) for alt in alts):
+				_index(self.words, alts, idx)
+			elif (match is not None and regexp.flags & re.IGNORECASE
+					and not regexp.flags & re.DOTALL
+					and _literals(match.group(3).split('|'))):
+				self.suffixes.append((idx, int(match.group(2)), tuple(
+						_lower(alt) for alt in match.group(3).split('|')),
+						match.group(1) == '.'))
+			else:
+				self.wordregexps.append((idx, regexp))
+		for idx, (name, regexp) in enumerate(beginnings.items()):
+			alts = _alternatives(regexp, BEGINLISTRE)
+			if alts is not None:
+				_index(self.beginnings, alts, idx)
+			else:
+				self.beginningregexps.append((idx, regexp))
+
+	def _begin(self, text, start, key, counts):
+		"""Count the beginnings categories matching at a line start."""
+		prev = None
+		for idx, _, alt, length, endsword, simple in self.beginnings.get(
+				key, ()):
+			if idx != prev and (simple and key
+					or _matches(text, start, alt, length, endsword)):
+				counts[idx] += 1
+				prev = idx
+
+	def scan(self, text, wordusage=None, beginnings=None, regexps=True):
+		"""Count all categories in ``text``.
+
+		:param wordusage, beginnings: if given, dictionaries to which the
+			counts are added; otherwise new dictionaries are created.
+		:param regexps: if ``False``, skip the categories that are counted
+			with their regular expression (``wordregexps`` and
+			``beginningregexps``).
+		:returns: a tuple with the ``wordusage`` and ``beginnings``
+			dictionaries."""
+		wordcounts = [0] * len(self.wordnames)
+		begincounts = [0] * len(self.beginningnames)
+		nextpos = [0] * len(self.wordnames)
+		words = self.words
+		suffixes = self.suffixes
+		nonwordbegin = '' in self.beginnings
+		linestart = 0
+		lineno = 0
+		firstrun = None
+		lastline = [-1] * len(self.wordnames)
+		folded = self.folded
+		if len(folded) > FOLDED:
+			folded.clear()
+		for match in SCANRE.finditer(text):
+			run = match.group()
+			if run == '\n':
+				if linestart is not None and nonwordbegin:
+					self._begin(text, linestart, '', begincounts)
+				linestart = match.end()
+				lineno += 1
+				firstrun = None
+				continue
+			start = match.start()
+			if run.isascii():
+				key = run.lower()
+			else:
+				key = folded.get(run)
+				if key is None:
+					key = folded[run] = run.translate(CASEFOLD).lower()
+			if firstrun is None:
+				firstrun = start
+			if linestart is not None:
+				if start == linestart:
+					self._begin(text, start, key, begincounts)
+				elif nonwordbegin:
+					self._begin(text, linestart, '', begincounts)
+				linestart = None
+			entries = words.get(key)
+			if entries is not None:
+				prev = None
+				for idx, _, alt, length, endsword, simple in entries:
+					if idx != prev and start >= nextpos[idx] and (
+							simple or _matches(
+								text, start, alt, length, endsword)):
+						wordcounts[idx] += 1
+						nextpos[idx] = start + length
+						prev = idx
+			for idx, minlen, alts, perline in suffixes:
+				if not key.endswith(alts):
+					continue
+				# the suffix must be preceded by minlen characters of this
+				# word, or of this line starting from its first word.
+				prefix = start - firstrun if perline else 0
+				if perline and lastline[idx] == lineno:
+					continue
+				if any(prefix + len(run) - len(alt) >= minlen
+						for alt in alts if key.endswith(alt)):
+					wordcounts[idx] += 1
+					lastline[idx] = lineno
+		if linestart is not None and nonwordbegin:
+			self._begin(text, linestart, '', begincounts)
+		if regexps:
+			for idx, regexp in self.wordregexps:
+				wordcounts[idx] += sum(1 for _ in regexp.finditer(text))
+			for idx, regexp in self.beginningregexps:
+				begincounts[idx] += sum(1 for _ in regexp.finditer(text))
+
+		if wordusage is None:
+			wordusage = dict.fromkeys(self.wordnames, 0)
+		if beginnings is None:
+			beginnings = dict.fromkeys(self.beginningnames, 0)
+		for name, count in zip(self.wordnames, wordcounts):
+			wordusage[name] += count
+		for name, count in zip(self.beginningnames, begincounts):
+			beginnings[name] += count
+		return wordusage, beginnings
+
+
+__all__ = ['Scanner']
@@ -0,0 +1,306 @@
+"""An HTTP server for scoring texts.
+
+Start with ``readability --serve [--host=<x>] [--port=<n>] [--jobs=<n>]``.
+Language data is loaded once at startup, and texts are scored by a pool of
+worker processes. Connections are kept alive between requests.
+
+Endpoints:
+
+``POST /measures``
+	A JSON object with either ``"text"``, a tokenized text, or ``"texts"``, a
+	list of such texts; optionally ``"lang"`` and ``"merge"`` as for
+	``getmeasures()``. The response has ``"result"`` or ``"results"``; a text
+	that cannot be scored gets an object with an ``"error"`` instead::
+
+		$ curl -d '{"texts": ["A sentence .", "Another one ."]}' \\
+				localhost:8000/measures
+
+``GET /stats``
+	Counters of requests, texts and words, throughput per second since
+	startup, and request latency percentiles in milliseconds over the most
+	recent requests.
+
+``GET /health``
+	Returns ``{"status": "ok"}`` and the available languages."""
+
+from __future__ import division, print_function, unicode_literals
+import os
+import sys
+import json
+import time
+import threading
+import collections
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from readability import getmeasures
+from readability.langdata import LANGDATA, getsyllabifier, getscanner
+from readability.lexicon import getlexicons, uselexicons
+
+MAXBODY = 64 << 20  # maximum size of a request body in bytes
+LATENCIES = 10000  # number of recent requests for latency percentiles
+
+
+class ServerStats(object):
+	"""Thread-safe counters of a server.
+
+	>>> stats = ServerStats()
+	>>> stats.add(0.002, texts=2, words=10)
+	>>> stats.add(0.004, error=True)
+	>>> result = stats.todict()
+	>>> result['requests'], result['errors'], result['latency_ms']['max']
+	(2, 1, 4.0)
+	"""
+
+	def __init__(self):
+		self.started = time.time()
+		self.requests = self.errors = self.texts = self.words = 0
+		self.latencies = collections.deque(maxlen=LATENCIES)
+		self._lock = threading.Lock()
+
+	def add(self, latency, texts=0, words=0, error=False):
+		"""Record a request that took ``latency`` seconds."""
+		with self._lock:
+			self.requests += 1
+			self.errors += error
+			self.texts += texts
+			self.words += words
+			self.latencies.append(latency)
+
+	def todict(self):
+		"""Return the counters as a dictionary."""
+		with self._lock:
+			latencies = sorted(self.latencies)
+			uptime = time.time() - self.started
+			result = collections.OrderedDict([
+					('uptime', round(uptime, 3)),
+					('requests', self.requests),
+					('errors', self.errors),
+					('texts', self.texts),
+					('words', self.words),
+					('requests_per_sec', round(self.requests / uptime, 3)),
+					('texts_per_sec', round(self.texts / uptime, 3)),
+					('words_per_sec', round(self.words / uptime, 3)),
+					])
+		result['latency_ms'] = collections.OrderedDict(
+				(name, round(1000 * latencies[
+					min(len(latencies) - 1, int(q * len(latencies)))], 3)
+					if latencies else None)
+				for name, q in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99),
+					('max', 1)))
+		return result
+
+
+class RequestError(Exception):
+	"""An invalid request; answered with status 400."""
+
+
+class ReadabilityHandler(BaseHTTPRequestHandler):
+	"""Handle requests; see the module documentation.
+
+	When the body of a request is not read, e.g., because the path or its
+	length is not valid, the connection is closed after the response, so
+	that the body is not taken for the next request:
+
+	>>> import socket
+	>>> server = ReadabilityServer(('127.0.0.1', 0), workers=0)
+	>>> threading.Thread(target=server.serve_forever).start()
+	>>> conn = socket.create_connection(server.server_address, timeout=10)
+	>>> body = b'GET /health HTTP/1.1\\r\\nHost: x\\r\\n\\r\\n'
+	>>> conn.sendall(b'POST /nope HTTP/1.1\\r\\nHost: x\\r\\n'
+	...		b'Content-Length: %d\\r\\n\\r\\n%s' % (len(body), body))
+	>>> response = b''.join(iter(lambda: conn.recv(65536), b''))
+	>>> response.count(b'HTTP/1.1 '), response.split(b'\\r\\n')[0]
+	(1, b'HTTP/1.1 404 Not Found')
+
+	Otherwise, the connection is kept alive:
+
+	>>> conn = socket.create_connection(server.server_address, timeout=10)
+	>>> body = b'{"text": "A sentence ."}'
+	>>> request = (b'POST /measures HTTP/1.1\\r\\nHost: x\\r\\n'
+	...		b'Content-Length: %d\\r\\n\\r\\n%s' % (len(body), body))
+	>>> conn.sendall(request + request)
+	>>> conn.shutdown(socket.SHUT_WR)
+	>>> response = b''.join(iter(lambda: conn.recv(65536), b''))
+	>>> response.count(b'HTTP/1.1 200 OK')
+	2
+	>>> conn.close(); server.shutdown(); server.server_close()
+	"""
+	protocol_version = 'HTTP/1.1'
+	server_version = 'readability'
+
+	def do_GET(self):
+		start = time.perf_counter()
+		if self.path == '/stats':
+			self._reply(200, self.server.stats.todict())
+		elif self.path == '/health':
+			self._reply(200, dict(status='ok', languages=list(LANGDATA)))
+		else:
+			self._reply(404, dict(error='not found: %s' % self.path))
+			self.server.stats.add(time.perf_counter() - start, error=True)
+
+	def do_POST(self):
+		start = time.perf_counter()
+		texts = words = 0
+		self.bodyread = False
+		try:
+			if self.path != '/measures':
+				self.close_connection = True
+				self._reply(404, dict(error='not found: %s' % self.path))
+				raise RequestError
+			request = self._readjson()
+			single = 'text' in request
+			batch = [request['text']] if single else request.get('texts')
+			lang = request.get('lang', self.server.lang)
+			if (not isinstance(batch, list)
+					or not all(isinstance(a, str) for a in batch)):
+				raise RequestError('expected "text" (a string) or "texts" '
+						'(a list of strings).')
+			elif not isinstance(lang, str) or lang not in LANGDATA:
+				raise RequestError('unknown language: %r' % lang)
+			results = self.server.score(
+					batch, lang, bool(request.get('merge', False)))
+		except RequestError as err:
+			if err.args:
+				self.close_connection |= not self.bodyread
+				self._reply(400, dict(error=err.args[0]))
+			error = True
+		except Exception as err:  # pylint: disable=broad-except
+			self.close_connection |= not self.bodyread
+			self._reply(500, dict(error='%s: %s' % (type(err).__name__, err)))
+			error = True
+		else:
+			texts = len(results)
+			words = sum(_words(result) for result in results)
+			self._reply(200, dict(result=results[0]) if single
+					else dict(results=results))
+			error = False
+		self.server.stats.add(time.perf_counter() - start, texts, words, error)
+
+	def _readjson(self):
+		"""Read and decode the JSON object in the request body."""
+		try:
+			length = int(self.headers.get('Content-Length', ''))
+		except ValueError:
+			raise RequestError('Content-Length required.')
+		if length < 0:
+			raise RequestError('invalid Content-Length.')
+		elif length > MAXBODY:
+			raise RequestError('request body too large.')
+		data = self.rfile.read(length)
+		self.bodyread = True
+		try:
+			request = json.loads(data.decode('utf8'))
+		except ValueError as err:
+			raise RequestError('invalid JSON: %s' % err)
+		if not isinstance(request, dict):
+			raise RequestError('expected a JSON object.')
+		return request
+
+	def _reply(self, status, obj):
+		body = json.dumps(obj).encode('utf8')
+		self.send_response(status)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(body)))
+		if self.close_connection:
+			self.send_header('Connection', 'close')
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+		if self.server.verbose:
+			BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+class ReadabilityServer(ThreadingHTTPServer):
+	"""An HTTP server that scores texts with a pool of worker processes.
+
+	:param address: a tuple ``(host, port)``.
+	:param lang: the language of requests that do not specify one.
+	:param workers: the number of worker processes; if 0, texts are scored
+		in the threads that handle the requests. Default: the number of
+		CPUs.
+	:param verbose: if ``True``, log each request to standard error."""
+	daemon_threads = True
+
+	def __init__(self, address, lang='en', workers=None, verbose=False):
+		ThreadingHTTPServer.__init__(self, address, ReadabilityHandler)
+		self.lang = lang
+		self.verbose = verbose
+		self.stats = ServerStats()
+		preload(LANGDATA)
+		self.workers = (os.cpu_count() or 1) if workers is None else workers
+		self.executor = None
+		if self.workers:
+			from concurrent.futures import ProcessPoolExecutor
+			# with fork, workers inherit the data preloaded above
+			self.executor = ProcessPoolExecutor(self.workers,
+					initializer=preload,
+					initargs=(list(LANGDATA), getlexicons()))
+
+	def score(self, texts, lang, merge):
+		"""Return a list with the result or an error for each text."""
+		if self.executor is None or not texts:
+			return _scorebatch(texts, lang, merge)
+		size = -(-len(texts) // self.workers)
+		results = []
+		for chunk in self.executor.map(_scorebatch,
+				*zip(*[(texts[n:n + size], lang, merge)
+					for n in range(0, len(texts), size)])):
+			results.extend(chunk)
+		return results
+
+	def server_close(self):
+		ThreadingHTTPServer.server_close(self)
+		if self.executor is not None:
+			self.executor.shutdown()
+
+
+def preload(langs, lexicons=None):
+	"""Load the language data, syllabifiers and scanners of the given
+	languages; a language with a missing optional dependency is skipped.
+
+	:param lexicons: syllable lexicons to use, as returned by
+		``readability.lexicon.getlexicons()``."""
+	if lexicons:
+		uselexicons(lexicons)
+	for lang in langs:
+		try:
+			getsyllabifier(lang)
+			getscanner(lang)
+		except ImportError:
+			pass
+
+
+def serve(host='127.0.0.1', port=8000, lang='en', workers=None,
+		verbose=False):
+	"""Run a ``ReadabilityServer`` until interrupted."""
+	server = ReadabilityServer((host, port), lang, workers, verbose)
+	print('serving on http://%s:%d/ with %d worker processes' % (
+			host, server.server_address[1], server.workers), file=sys.stderr)
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.server_close()
+
+
+def _scorebatch(texts, lang, merge):
+	"""Score a list of texts; runs in a worker process."""
+	results = []
+	for text in texts:
+		try:
+			results.append(getmeasures(text, lang=lang, merge=merge))
+		except Exception as err:  # pylint: disable=broad-except
+			results.append(dict(error='%s: %s' % (type(err).__name__, err)))
+	return results
+
+
+def _words(result):
+	"""Return the number of words in a result, or 0 for an error."""
+	if 'error' in result:
+		return 0
+	return result['words'] if 'words' in result else result[
+			'sentence info']['words']
+
+
+__all__ = ['ReadabilityServer', 'ServerStats', 'serve']
@@ -0,0 +1,88 @@
+"""Rescore a document that is edited, counting only changed paragraphs.
+
+>>> session = DocumentSession('en')
+>>> result = session.update('A tokenized sentence .\\n\\nAnother sentence .')
+>>> session.update('A tokenized sentence .\\n\\nAnother one .\\n\\nAnd a third .'
+...		)['sentence info']['words']
+8
+>>> session.recounted
+2
+"""
+
+from __future__ import unicode_literals
+import hashlib
+import collections
+from readability import PARARE, ReadabilityCounts, getcounts, unicode
+
+
+class DocumentSession(object):
+	"""The counts of a document that is updated as a whole, cached per
+	paragraph under a hash of its content.
+
+	An update splits the text at paragraph breaks, counts the paragraphs
+	that are not in the cache, and adjusts the totals for the paragraphs that
+	were added or removed; unchanged paragraphs are not counted again. The
+	result is the same as that of ``getmeasures()`` for the whole text, as
+	long as no category of word usage or sentence beginnings has a match that
+	spans a paragraph break (see ``ReadabilityAccumulator.updateparagraphs``).
+
+	:param lang: a language code.
+	:ivar counts: the ``ReadabilityCounts`` of the current text; the
+		vocabulary is a ``Counter`` with the number of paragraphs in which
+		each word type occurs.
+	:ivar recounted: the number of paragraphs counted by the last update."""
+
+	def __init__(self, lang='en'):
+		self.lang = lang
+		self.counts = ReadabilityCounts(lang)
+		self.counts.vocabulary = collections.Counter()
+		self.recounted = 0
+		self._keys = collections.Counter()  # hash => occurrences in text
+		self._cache = {}  # hash => ReadabilityCounts of paragraph
+
+	def update(self, text, merge=False):
+		"""Replace the text of the document.
+
+		:param text: the whole document, as a single unicode string in the
+			format of ``getmeasures()``.
+		:param merge: as for ``getmeasures()``.
+		:returns: the same dictionary as ``getmeasures()``."""
+		if not isinstance(text, unicode):
+			raise ValueError('Expected: unicode string')
+		keys = collections.Counter()
+		self.recounted = 0
+		for paragraph in PARARE.split(text):
+			key = hashlib.blake2b(
+					paragraph.encode('utf8'), digest_size=16).digest()
+			if key not in self._cache:
+				self._cache[key] = getcounts(paragraph, self.lang)
+				self.recounted += 1
+			keys[key] += 1
+		for key in set(keys) | set(self._keys):
+			diff = keys[key] - self._keys[key]
+			if diff:
+				self._add(self._cache[key], diff)
+			if not keys[key]:
+				del self._cache[key]
+		self._keys = keys
+		return self.counts.measures(merge)
+
+	def _add(self, paragraph, times):
+		"""Add the counts of a paragraph a number of times, which may be
+		negative to remove it."""
+		counts = self.counts
+		for field in ReadabilityCounts.FIELDS:
+			setattr(counts, field,
+					getattr(counts, field) + times * getattr(paragraph, field))
+		for name, count in paragraph.wordusage.items():
+			counts.wordusage[name] += times * count
+		for name, count in paragraph.beginnings.items():
+			counts.beginnings[name] += times * count
+		vocabulary = counts.vocabulary
+		for word in paragraph.vocabulary:
+			vocabulary[word] += times
+			if not vocabulary[word]:
+				del vocabulary[word]
+
+
+__all__ = ['DocumentSession']
@@ -0,0 +1,107 @@
+"""Approximate counting of distinct word types in bounded memory.
+
+Reference: Flajolet et al. (2007). HyperLogLog: the analysis of a near-optimal
+cardinality estimation algorithm. In Proc. of AofA, pp. 127-146."""
+
+from __future__ import division, unicode_literals
+import math
+import base64
+import struct
+import hashlib
+
+
+class HyperLogLog(object):
+	"""A mergeable estimate of the number of distinct strings added to it.
+
+	Uses ``2 ** precision`` one-byte registers; the relative standard error
+	of the estimate is about ``1.04 / sqrt(2 ** precision)``, i.e., 1.6 % for
+	the default precision of 12.
+
+	>>> sketch = HyperLogLog(12)
+	>>> sketch.update('type%d' % n for n in range(1000))
+	>>> other = HyperLogLog(12)
+	>>> other.update('type%d' % n for n in range(500, 1500))
+	>>> 1450 < len(sketch.merge(other)) < 1550
+	True
+	"""
+
+	def __init__(self, precision=12):
+		if not 4 <= precision <= 18:
+			raise ValueError('precision should be between 4 and 18.')
+		self.precision = precision
+		self.registers = bytearray(1 << precision)
+
+	def add(self, word):
+		"""Add a single string."""
+		digest = hashlib.blake2b(word.encode('utf8'), digest_size=8).digest()
+		value = struct.unpack('>Q', digest)[0]
+		bits = 64 - self.precision
+		idx = value >> bits
+		rank = bits - (value & ((1 << bits) - 1)).bit_length() + 1
+		if rank > self.registers[idx]:
+			self.registers[idx] = rank
+
+	def update(self, words):
+		"""Add an iterable of strings, or merge another sketch."""
+		if isinstance(words, HyperLogLog):
+			self.merge(words)
+			return
+		for word in words:
+			self.add(word)
+
+	def merge(self, other):
+		"""Merge another sketch into this one, which then estimates the
+		number of distinct strings added to either; returns self."""
+		if other.precision != self.precision:
+			raise ValueError('cannot merge sketches with precision %d and %d'
+					% (self.precision, other.precision))
+		self.registers = bytearray(map(max, self.registers, other.registers))
+		return self
+
+	def copy(self):
+		"""Return an independent copy of this sketch."""
+		result = HyperLogLog(self.precision)
+		result.registers[:] = self.registers
+		return result
+
+	def estimate(self):
+		"""Return the estimated number of distinct strings as a float."""
+		m = len(self.registers)
+		if m == 16:
+			alpha = 0.673
+		elif m == 32:
+			alpha = 0.697
+		elif m == 64:
+			alpha = 0.709
+		else:
+			alpha = 0.7213 / (1 + 1.079 / m)
+		result = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+		zeros = self.registers.count(0)
+		if result <= 2.5 * m and zeros:  # small range correction
+			result = m * math.log(m / zeros)
+		return result
+
+	def __len__(self):
+		return int(round(self.estimate()))
+
+	def __eq__(self, other):
+		return (isinstance(other, HyperLogLog)
+				and self.registers == other.registers)
+
+	def __ne__(self, other):
+		return not self == other
+
+	def todict(self):
+		"""Return the sketch as a dictionary of JSON serializable values."""
+		return dict(precision=self.precision,
+				registers=base64.b64encode(bytes(self.registers)).decode('ascii'))
+
+	@classmethod
+	def fromdict(cls, data):
+		"""Inverse of ``todict()``."""
+		result = cls(data['precision'])
+		result.registers[:] = base64.b64decode(data['registers'])
+		return result
+
+
+__all__ = ['HyperLogLog']
@@ -0,0 +1,254 @@
+"""Readability of parts of a document.
+
+The counts of each word or sentence are computed once and stored as prefix
+sums, after which the counts of any span of words or sentences are the
+difference of two prefix sums, and the readability formulas are applied to
+them directly.
+
+>>> analysis = analyze('A tokenized sentence .\\nAnother sentence .\\n\\n'
+...		'And a third .')
+>>> analysis.numsentences, analysis.numparagraphs
+(3, 2)
+>>> analysis.counts(0, 2)['words'], analysis.paragraphspan(1)
+(5, (2, 3))
+>>> round(analysis.paragraph(1)['FleschReadingEase'], 2)
+147.39"""
+
+from __future__ import division, unicode_literals
+import array
+import collections
+from readability import (PUNCTCHARS, ReadabilityAccumulator, getgrades,
+		unicode)
+
+FIELDS = ('characters', 'syllables', 'long_words', 'complex_words',
+		'complex_words_dc')
+
+
+def itersentences(text):
+	"""Yield the sentences of a text with the index of their paragraph.
+
+	Sentences and paragraphs are the same as those counted by
+	``getmeasures()``; for a string, a paragraph may be empty.
+
+	:param text: a unicode string or an iterable of lines.
+	:yields: tuples ``(paragraph, sentence)``."""
+	if isinstance(text, unicode):
+		lines = text.split('\n')
+		last = len(lines) - 1
+		paragraph = 0
+		prevempty = False
+		for n, line in enumerate(lines):
+			if line:
+				yield paragraph, line
+				prevempty = False
+			elif 0 < n < last and not prevempty:
+				paragraph += 1
+				prevempty = True
+	else:
+		paragraph = -1
+		prevempty = True
+		for line in text:
+			line = line.strip()
+			if not line:
+				prevempty = True
+				continue
+			elif prevempty:
+				paragraph += 1
+			prevempty = False
+			yield paragraph, line
+
+
+class WordCounts(object):
+	"""Prefix sums of the counts of each word in a text.
+
+	>>> counts = WordCounts('A tokenized sentence .\\nAnother sentence .')
+	>>> counts.words, counts.get('syllables', 0, 3), counts.sentences(1, 5)
+	(5, 6, 2)
+
+	:param text: a unicode string or an iterable of lines, as for
+		``getmeasures()``.
+	:param lang: a language code.
+	:ivar words: the number of words (tokens that are not punctuation).
+	:ivar sentence: for each word, the index of its sentence."""
+
+	def __init__(self, text, lang='en'):
+		self.lang = lang
+		acc = ReadabilityAccumulator(lang)
+		prefix = [[0] for _ in FIELDS]
+		self.sentence = array.array('l')
+		info = {}
+		totals = [0] * len(FIELDS)
+		for sentno, (_, line) in enumerate(itersentences(text)):
+			for token in line.split():
+				if not token.strip(PUNCTCHARS):
+					continue
+				counts = info.get(token)
+				if counts is None:
+					counts = info[token] = acc.wordinfo(token)
+				for n, count in enumerate(counts):
+					totals[n] += count
+					prefix[n].append(totals[n])
+				self.sentence.append(sentno)
+		self.prefix = dict(zip(FIELDS, (array.array('q', a) for a in prefix)))
+		self.words = len(self.sentence)
+
+	def get(self, field, start, end):
+		"""Return the sum of a field over the words ``start:end``."""
+		prefix = self.prefix[field]
+		return prefix[end] - prefix[start]
+
+	def sentences(self, start, end):
+		"""Return the number of sentences with a word in ``start:end``."""
+		return self.sentence[end - 1] - self.sentence[start] + 1
+
+	def grades(self, start, end):
+		"""Return the readability grades of the words ``start:end``."""
+		prefix = self.prefix
+		characters, syllables, long_words, complex_words, complex_words_dc = [
+				prefix[field][end] - prefix[field][start] for field in FIELDS]
+		return getgrades(self.lang, characters, syllables, end - start,
+				self.sentences(start, end), long_words, complex_words,
+				complex_words_dc, complex_words_dc)
+
+
+class DocumentAnalysis(object):
+	"""Counts of each sentence and paragraph of a text, for the readability of
+	any range of sentences or paragraphs in constant time.
+
+	Sentences and paragraphs are numbered from 0, and ranges are given as
+	``start, end`` with ``end`` exclusive, as for slices.
+
+	:param text: a unicode string or an iterable of lines, as for
+		``getmeasures()``.
+	:param lang: a language code.
+	:ivar numsentences: the number of sentences.
+	:ivar numparagraphs: the number of paragraphs with at least one
+		sentence.
+	:ivar paragraphstarts: an array with the first sentence of each
+		paragraph, followed by the number of sentences."""
+
+	def __init__(self, text, lang='en'):
+		self.lang = lang
+		acc = ReadabilityAccumulator(lang)
+		fields = ('words', ) + FIELDS
+		prefix = [[0] for _ in fields]
+		self.paragraphstarts = array.array('l')
+		info = {}
+		totals = [0] * len(fields)
+		prevparagraph = None
+		sentno = -1
+		for sentno, (paragraph, line) in enumerate(itersentences(text)):
+			if paragraph != prevparagraph:
+				self.paragraphstarts.append(sentno)
+				prevparagraph = paragraph
+			for token in line.split():
+				if not token.strip(PUNCTCHARS):
+					continue
+				counts = info.get(token)
+				if counts is None:
+					counts = info[token] = acc.wordinfo(token)
+				totals[0] += 1
+				for n, count in enumerate(counts, 1):
+					totals[n] += count
+			for n, total in enumerate(totals):
+				prefix[n].append(total)
+		self.numsentences = sentno + 1
+		self.numparagraphs = len(self.paragraphstarts)
+		self.paragraphstarts.append(self.numsentences)
+		self.prefix = dict(zip(fields, (array.array('q', a) for a in prefix)))
+
+	def counts(self, start, end):
+		"""Return the counts of the sentences ``start:end``.
+
+		:returns: an ordered dictionary with the number of characters,
+			syllables, words, sentences, long words, complex words and words
+			that are not basic words (Dale-Chall)."""
+		if not 0 <= start <= end <= self.numsentences:
+			raise IndexError('sentence range out of bounds: %d:%d' % (
+					start, end))
+		prefix = self.prefix
+		result = collections.OrderedDict(
+				(field, prefix[field][end] - prefix[field][start])
+				for field in ('characters', 'syllables', 'words'))
+		result['sentences'] = end - start
+		for field in FIELDS[2:]:
+			result[field] = prefix[field][end] - prefix[field][start]
+		return result
+
+	def grades(self, start, end):
+		"""Return the readability grades of the sentences ``start:end``."""
+		counts = self.counts(start, end)
+		if not counts['words']:
+			raise ValueError("I can't do this, there's no words there!")
+		return getgrades(self.lang, counts['characters'],
+				counts['syllables'], counts['words'], counts['sentences'],
+				counts['long_words'], counts['complex_words'],
+				counts['complex_words_dc'], counts['complex_words_dc'])
+
+	def paragraphspan(self, start, end=None):
+		"""Return the range of sentences of the paragraphs ``start:end``, or
+		of paragraph ``start`` if ``end`` is not given."""
+		if end is None:
+			end = start + 1
+		if not 0 <= start <= end <= self.numparagraphs:
+			raise IndexError('paragraph range out of bounds: %d:%d' % (
+					start, end))
+		return self.paragraphstarts[start], self.paragraphstarts[end]
+
+	def paragraph(self, n):
+		"""Return the readability grades of paragraph ``n``."""
+		return self.grades(*self.paragraphspan(n))
+
+	def section(self, start, end):
+		"""Return the readability grades of the paragraphs ``start:end``."""
+		return self.grades(*self.paragraphspan(start, end))
+
+
+def analyze(text, lang='en'):
+	"""Count the sentences and paragraphs of a text once, for queries of
+	the readability of parts of it; see ``DocumentAnalysis``."""
+	return DocumentAnalysis(text, lang)
+
+
+def getprofile(text, lang='en', size=500, stride=100):
+	"""Compute readability grades over a sliding window of words.
+
+	Words are tokens that are not punctuation. The sentences of a window are
+	those of which it contains at least one word. The windows start at every
+	``stride`` words and contain ``size`` words, with a last window that ends
+	at the last word if the others do not; if the text has fewer words,
+	there is a single window with all words. Each word is counted once, so
+	the time is linear in the length of the text.
+
+	>>> text = 'A tokenized sentence .\\nAnother sentence .\\nAnd a third .'
+	>>> profile = getprofile(text, size=4, stride=2)
+	>>> [(start, end) for start, end, _ in profile]
+	[(0, 4), (2, 6), (4, 8)]
+	>>> [(start, end) for start, end, _ in getprofile(text, size=3, stride=3)]
+	[(0, 3), (3, 6), (5, 8)]
+	>>> round(profile[0][2]['FleschReadingEase'], 2)
+	35.61
+
+	:param text: a unicode string or an iterable of lines, as for
+		``getmeasures()``.
+	:param lang: a language code.
+	:param size: the number of words in a window.
+	:param stride: the number of words between the starts of windows.
+	:returns: a list of tuples ``(start, end, grades)``, with the word
+		offsets of each window and its ``readability grades`` as in the
+		result of ``getmeasures()``."""
+	if size < 1 or stride < 1:
+		raise ValueError('size and stride should be positive.')
+	counts = WordCounts(text, lang)
+	if not counts.words:
+		raise ValueError("I can't do this, there's no words there!")
+	size = min(size, counts.words)
+	starts = list(range(0, counts.words - size + 1, stride))
+	if starts[-1] != counts.words - size:
+		starts.append(counts.words - size)
+	return [(start, start + size, counts.grades(start, start + size))
+			for start in starts]
+
+
+__all__ = ['itersentences', 'WordCounts', 'getprofile', 'DocumentAnalysis',
+		'analyze']
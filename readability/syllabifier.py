@@ -0,0 +1,186 @@
+"""Syllabification engines.
+
+An engine is registered under a name together with a factory; the factory is
+called with a language code and returns a function that counts the syllables
+of a single word. Entries in ``LANGDATA`` may refer to an engine by name
+instead of holding a function; each engine is instantiated once per language
+and the resulting ``Syllabifier`` is shared by all subsequent calls.
+
+Syllable counts are memoized in a ``SyllableCache``, which is bounded and safe
+to use from multiple threads."""
+
+from __future__ import unicode_literals
+import threading
+import collections
+
+CACHESIZE = 100000
+ENGINES = {}
+_instances = {}
+_lock = threading.Lock()
+
+
+class SyllableCache(object):
+	"""A thread-safe cache of syllable counts with a bounded size.
+
+	When the cache is full, the least recently used entry is evicted. Pinned
+	entries are never evicted and do not count towards the size.
+
+	>>> cache = SyllableCache(maxsize=2, pinned={'mr': 2})
+	>>> cache['a'] = 1; cache['be'] = 1; cache['sea'] = 1
+	>>> cache.get('a'), cache.get('mr'), cache.get('sea')
+	(None, 2, 1)
+	>>> cache.stats() == dict(hits=2, misses=1, evictions=1, size=2,
+	...		maxsize=2, pinned=1)
+	True
+
+	:param maxsize: the maximum number of entries that are not pinned.
+	:param pinned: a mapping of words to syllable counts that should always
+		be in the cache."""
+
+	def __init__(self, maxsize=CACHESIZE, pinned=None):
+		self.maxsize = maxsize
+		self.pinned = dict(pinned or ())
+		self.hits = self.misses = self.evictions = 0
+		self._data = collections.OrderedDict()
+		self._lock = threading.Lock()
+
+	def get(self, word, default=None):
+		"""Return the cached count for ``word``, or ``default``."""
+		with self._lock:
+			if word in self.pinned:
+				self.hits += 1
+				return self.pinned[word]
+			try:
+				result = self._data[word]
+			except KeyError:
+				self.misses += 1
+				return default
+			self._data.move_to_end(word)
+			self.hits += 1
+			return result
+
+	def __setitem__(self, word, count):
+		with self._lock:
+			if word in self.pinned:
+				return
+			self._data[word] = count
+			self._data.move_to_end(word)
+			while len(self._data) > self.maxsize:
+				self._data.popitem(last=False)
+				self.evictions += 1
+
+	def __getitem__(self, word):
+		result = self.get(word)
+		if result is None:
+			raise KeyError(word)
+		return result
+
+	def __contains__(self, word):
+		with self._lock:
+			return word in self.pinned or word in self._data
+
+	def __len__(self):
+		return len(self.pinned) + len(self._data)
+
+	def pin(self, word, count):
+		"""Add an entry that is never evicted."""
+		with self._lock:
+			self._data.pop(word, None)
+			self.pinned[word] = count
+
+	def clear(self):
+		"""Remove all entries that are not pinned and reset the counters."""
+		with self._lock:
+			self._data.clear()
+			self.hits = self.misses = self.evictions = 0
+
+	def stats(self):
+		"""Return a dictionary with the number of hits, misses and evictions,
+		and the current number of (pinned) entries."""
+		with self._lock:
+			return dict(hits=self.hits, misses=self.misses,
+					evictions=self.evictions, size=len(self._data),
+					maxsize=self.maxsize, pinned=len(self.pinned))
+
+
+class Syllabifier(object):
+	"""A memoizing syllable counter for a single language.
+
+	>>> syll = Syllabifier(len)
+	>>> syll('word'), syll.syllabify(['a', 'word', 'word'])
+	(4, [1, 4, 4])
+
+	:param func: a function that counts the syllables of a word.
+	:param maxsize: the size of the ``SyllableCache`` used for memoization."""
+
+	def __init__(self, func, maxsize=CACHESIZE):
+		self.func = func
+		self.cache = SyllableCache(maxsize)
+
+	def __call__(self, word):
+		result = self.cache.get(word)
+		if result is None:
+			result = self.cache[word] = self.func(word)
+		return result
+
+	def syllabify(self, tokens):
+		"""Return a list with the number of syllables of each token.
+
+		Each distinct token is only looked up once."""
+		counts = {token: self(token) for token in set(tokens)}
+		return [counts[token] for token in tokens]
+
+
+def register(name, factory):
+	"""Register a syllabifier engine.
+
+	:param name: the name by which ``LANGDATA`` entries refer to the engine.
+	:param factory: a function taking a language code and returning a
+		function that maps a word to its number of syllables."""
+	with _lock:
+		ENGINES[name] = factory
+		# instances created by a previous registration are now stale.
+		for key in [key for key in _instances if key[0] == name]:
+			del _instances[key]
+
+
+def get(engine, lang):
+	"""Return the shared ``Syllabifier`` for an engine and language.
+
+	:param engine: the name of a registered engine, or a function that counts
+		the syllables of a word.
+	:param lang: the language code passed to the engine factory."""
+	key = (engine, lang)
+	try:
+		return _instances[key]
+	except KeyError:
+		pass
+	with _lock:
+		if key not in _instances:
+			if callable(engine):
+				func = engine
+			elif engine in ENGINES:
+				func = ENGINES[engine](lang)
+			else:
+				raise ValueError('unknown syllabifier engine: %r' % engine)
+			_instances[key] = Syllabifier(func)
+		return _instances[key]
+
+
+def _pyphen(lang):
+	"""Count syllables as the number of parts after hyphenation.
+
+	Uses Pyphen (https://pyphen.org/); the hyphenation dictionary is loaded
+	once."""
+	import pyphen
+	dic = pyphen.Pyphen(lang=lang)
+
+	def countsyllables(word):
+		# Count the syllables as the number of hyphenated parts (minimum 1):
+		return max(1, len(dic.inserted(word).split('-')))
+	return countsyllables
+
+
+register('pyphen', _pyphen)
+
+__all__ = ['SyllableCache', 'Syllabifier', 'register', 'get']
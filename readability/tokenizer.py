@@ -0,0 +1,151 @@
+"""A fast rule-based tokenizer for raw text.
+
+Raw text is split into paragraphs at empty lines, into sentences after
+sentence-final punctuation, and into words and punctuation tokens, with a
+few rules per language for abbreviations and elision. The tokenized
+sentences are generated one at a time in the format expected by
+``getmeasures()``, so raw text can be scored without a tokenizer process or
+an intermediate tokenized copy of the text::
+
+	>>> from readability import getmeasures
+	>>> text = 'This is an example sentence. Note the spaces.\\n\\nBye!'
+	>>> getmeasures(tokenize(text))['sentence info']['sentences']
+	3
+
+On the command line, use ``--tokenizer=builtin``. For the best results, use
+a dedicated tokenizer; see the README."""
+
+from __future__ import unicode_literals
+import re
+from readability import unicode
+
+# abbreviations that do not end a sentence, without the final period; the
+# lookup ignores case
+ABBREVIATIONS = dict(
+		en='mr mrs ms dr prof st jr sr vs etc vol approx dept est inc ltd '
+			'co corp feb apr aug sept oct nov dec',
+		nl='dhr mevr mw dr drs ir ing prof mr st bijv bv enz etc nr vgl ca '
+			'resp jl jhr blz pag zgn evt incl excl',
+		de='hr fr dr prof st bzw ca usw vgl nr bspw evtl ggf inkl zzgl '
+			'sog jh abs abb str tel',
+		fr='m mm mme mmes mlle mlles dr pr st ste etc cf vol ex env '
+			'av apr chap fig nº')
+# elided forms that are separate tokens, such as French l'homme => l' homme
+ELISIONS = dict(
+		fr="c d j l m n s t qu jusqu lorsqu puisqu quoiqu presqu quelqu")
+
+APOSTROPHES = "'’"
+ENDS = frozenset(['.', '!', '?', '...', '…'])
+# punctuation that may follow the end of a sentence and belongs to it
+CLOSING = frozenset(['"', "'", ')', ']', '}', '”', '’', '»',
+		'›']) | ENDS
+PARAGRAPHRE = re.compile(r'\n[^\S\n]*\n\s*')
+_rules = {}
+
+
+def tokenize(text, lang='en'):
+	"""Generate the tokenized sentences of a raw text.
+
+	>>> for line in tokenize('Dr. Watson met J. Smith at 10.30, i.e. '
+	...		'"a friend". He left...\\n\\nThe end.'):
+	...		print(line)
+	Dr. Watson met J. Smith at 10.30 , i.e. " a friend " .
+	He left ...
+	<BLANKLINE>
+	The end .
+	<BLANKLINE>
+	>>> list(tokenize("L'homme qu'il a vu.", lang='fr'))
+	["L' homme qu' il a vu .", '']
+	>>> list(tokenize(['This is one line', 'and another line.', '', 'Two.']))
+	['This is one line and another line .', '', 'Two .', '']
+
+	:param text: a unicode string, or an iterable of lines with or without
+		line endings, such as an open file or a list of strings; lines within
+		a paragraph are joined.
+	:param lang: a language code; selects the abbreviations and elisions
+		that are recognized.
+	:yields: a line with space-separated tokens for each sentence, and an
+		empty line after each paragraph."""
+	tokenre, abbreviations = _getrules(lang)
+	for paragraph in _paragraphs(text):
+		for sentence in _sentences(paragraph, tokenre, abbreviations):
+			yield ' '.join(sentence)
+		yield ''
+
+
+def _paragraphs(text):
+	"""Split raw text at empty lines; yield the non-empty paragraphs."""
+	if isinstance(text, unicode):
+		start = 0
+		for match in PARAGRAPHRE.finditer(text):
+			if text[start:match.start()].strip():
+				yield text[start:match.start()]
+			start = match.end()
+		if text[start:].strip():
+			yield text[start:]
+		return
+	lines = []
+	for line in text:
+		if line.strip():
+			lines.append(line.rstrip('\n'))
+		elif lines:
+			yield '\n'.join(lines)
+			lines = []
+	if lines:
+		yield '\n'.join(lines)
+
+
+def _sentences(paragraph, tokenre, abbreviations):
+	"""Split a paragraph into tokens and sentences; yield lists of tokens."""
+	sentence = []
+	ended = False  # whether the tokens so far end with a sentence end
+	for match in tokenre.finditer(paragraph):
+		token = match.group()
+		# a word followed by a period, which is separate unless the word is
+		# an abbreviation
+		if (token[-1] == '.' and match.lastgroup == 'word'
+				and token[:-1].lower() not in abbreviations):
+			tokens = (token[:-1], '.')
+		else:
+			tokens = (token, )
+		for token in tokens:
+			if ended:
+				# a quote is closing unless it is attached to the next word
+				if token in CLOSING and not (token in '"\'’' and
+						paragraph[match.end():match.end() + 1].isalnum()):
+					sentence.append(token)
+					continue
+				ended = False
+				if not token[0].islower():
+					yield sentence
+					sentence = []
+			sentence.append(token)
+			ended = token in ENDS
+	if sentence:
+		yield sentence
+
+
+def _getrules(lang):
+	"""Return the compiled token regex and the set of abbreviations of a
+	language."""
+	if lang not in _rules:
+		elisions = '|'.join(sorted(
+				ELISIONS.get(lang, '').split(), key=len, reverse=True))
+		_rules[lang] = re.compile(r"""
+			%s
+			\d+(?:[.,:/]\d+)+                # numbers: 10.30, 1,000, 1/2
+			| (?:[^\W\d_]\.){2,}             # abbreviations: i.e., U.S.
+			| [A-ZÀ-ÖØ-Þ]\.(?=\s+[^\W\d_])   # initials: J. Smith
+			| (?P<word>\w+(?:[-%s]\w+)*(?:\.(?!\.))?)  # well-known, Dr.
+			| \.{2,} | -{2,}                 # ellipsis, dashes
+			| \S                             # any other character
+			""" % (
+				r'(?i:%s)[%s](?=\w) |' % (elisions, APOSTROPHES)
+					if elisions else '',
+				APOSTROPHES),
+			re.VERBOSE | re.UNICODE), frozenset(
+				ABBREVIATIONS.get(lang, '').split())
+	return _rules[lang]
+
+
+__all__ = ['tokenize', 'ABBREVIATIONS', 'ELISIONS']
@@ -16,11 +16,13 @@ setup(
 			'Intended Audience :: Science/Research',
 			'License :: OSI Approved :: Apache Software License',
 			'Operating System :: POSIX',
-			'Programming Language :: Python :: 2.7',
-			'Programming Language :: Python :: 3.3',
+			'Programming Language :: Python :: 3',
+			'Programming Language :: Python :: 3 :: Only',
+			'Programming Language :: Python :: 3.7',
 			'Programming Language :: Cython',
 			'Topic :: Text Processing :: Linguistic',
 	],
+	python_requires='>=3.7',
 	packages=['readability',],
 	scripts=['bin/readability'],
 )